@@ -0,0 +1,110 @@
+import argparse
+import csv
+import getpass
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+# 다중 사용자 모드 계정 (아이디, 솔트, 비밀번호 해시)
+# 강사가 python accounts.py add alice 로 계정을 만들고 학생에게 초기 비밀번호를 알려 준다.
+# 비밀번호는 PBKDF2-SHA256 해시로만 보관하고, 앱은 로그인할 때 한 번만 확인한다.
+DEFAULT_ACCOUNTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "accounts.csv")
+FIELDS = ("user_id", "salt", "password_hash")
+HASH_ITERATIONS = 200_000
+# 없는 아이디도 같은 시간이 걸리도록 비교할 때 쓰는 솔트
+_DUMMY_SALT = "00" * 16
+
+_write_lock = threading.Lock()
+
+
+def hash_password(password, salt, iterations=HASH_ITERATIONS):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), bytes.fromhex(salt), iterations).hex()
+
+
+# {아이디: (솔트, 해시)} (파일이 없으면 빈 딕셔너리)
+def load_accounts(path=DEFAULT_ACCOUNTS_PATH):
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return {row["user_id"]: (row["salt"], row["password_hash"]) for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        return {}
+
+
+def verify_password(accounts, user_id, password):
+    salt, expected = accounts.get(user_id, (_DUMMY_SALT, ""))
+    actual = hash_password(password, salt)
+    return user_id in accounts and hmac.compare_digest(actual, expected)
+
+
+def _write_accounts(path, accounts):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(FIELDS)
+        for user_id, (salt, password_hash) in sorted(accounts.items()):
+            writer.writerow((user_id, salt, password_hash))
+    os.replace(path + ".tmp", path)
+
+
+# 계정을 만들거나 비밀번호를 바꿈
+def set_password(path, user_id, password):
+    salt = secrets.token_hex(16)
+    with _write_lock:
+        accounts = load_accounts(path)
+        accounts[user_id] = (salt, hash_password(password, salt))
+        _write_accounts(path, accounts)
+
+
+# 없는 아이디면 False
+def remove_account(path, user_id):
+    with _write_lock:
+        accounts = load_accounts(path)
+        if accounts.pop(user_id, None) is None:
+            return False
+        _write_accounts(path, accounts)
+        return True
+
+
+# python accounts.py add alice            (비밀번호 입력)
+# python accounts.py add alice --generate (임의 비밀번호를 만들어 출력)
+# python accounts.py remove alice
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="다중 사용자 모드 계정 관리")
+    parser.add_argument("--accounts", default=os.environ.get("MEDTERM_ACCOUNTS_PATH", DEFAULT_ACCOUNTS_PATH))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="계정을 만들거나 비밀번호를 바꿉니다")
+    add_parser.add_argument("user_id")
+    add_parser.add_argument("--generate", action="store_true", help="임의 비밀번호를 만들어 출력")
+    remove_parser = subparsers.add_parser("remove")
+    remove_parser.add_argument("user_id")
+    subparsers.add_parser("list")
+    args = parser.parse_args(argv)
+
+    if args.command == "add":
+        user_id = args.user_id.strip()
+        if not user_id:
+            parser.error("아이디가 비어 있습니다")
+        if args.generate:
+            password = secrets.token_urlsafe(9)
+            print(f"{user_id}: {password}")
+        else:
+            password = getpass.getpass(f"{user_id} 비밀번호: ")
+            if password != getpass.getpass("비밀번호 확인: "):
+                parser.error("비밀번호가 일치하지 않습니다")
+        if not password:
+            parser.error("비밀번호가 비어 있습니다")
+        set_password(args.accounts, user_id, password)
+    elif args.command == "remove":
+        if not remove_account(args.accounts, args.user_id):
+            parser.error(f"없는 계정입니다: {args.user_id}")
+    else:
+        for user_id in sorted(load_accounts(args.accounts)):
+            print(user_id)
+
+
+if __name__ == "__main__":
+    main()
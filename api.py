@@ -0,0 +1,251 @@
+import argparse
+import hmac
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import term_store
+from progress_store import DEFAULT_PROGRESS_PATH, ProgressStore, open_backend
+from rewards import REWARDS, next_reward
+from srs import QUALITY_GOOD
+from stats import month_key
+
+# 화면 없이 쓰는 HTTP/JSON API (모바일 앱, LMS 연동용)
+# Streamlit 앱과 같은 카탈로그·진행 상황 저장소 로직을 그대로 쓴다. 이벤트 루프는 요청을 받고
+# 응답만 만들고, 저장소 접근(잠금·SQLite)은 스레드 풀에서 실행한다.
+# Streamlit 앱과 같은 진행 상황 DB를 열어도 된다: 저장소가 기록 주기마다 사용자별 버전을 확인해
+# 다른 프로세스가 기록한 사용자를 다시 읽는다 (ProgressStore 참고).
+# MEDTERM_API_TOKEN은 LMS 같은 신뢰하는 서버에 주는 토큰으로 모든 사용자의 기록에 접근할 수 있다
+# (학생 개인 인증은 앱의 accounts.py 계정으로 한다).
+#
+#   python api.py --port 8000
+#   TestClient(create_app(progress_path="/tmp/progress.db")).get("/api/users/alice/today")
+CATALOG_CHECK_INTERVAL = 1.0
+
+
+class ApiError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+# 용어 파일이 바뀌면 다시 읽는 카탈로그 (파일 시각 확인은 check_interval마다 한 번)
+# path가 None이면 확인할 때마다 term_store.default_terms_path()를 따른다 (작업용 덱이 새로 생긴 경우)
+class CatalogCache:
+    def __init__(self, path=None, check_interval=CATALOG_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked = 0.0
+        self._catalog = None
+
+    def get(self):
+        if self._catalog is not None and time.monotonic() - self._checked < self.check_interval:
+            return self._catalog
+        with self._lock:
+            path = self.path or term_store.default_terms_path()
+            version = (path, os.path.getmtime(path))
+            if version != self._version:
+                self._catalog = term_store.load_catalog(path)
+                self._version = version
+            self._checked = time.monotonic()
+            return self._catalog
+
+
+def _term_json(catalog, term_id, progress=None):
+    term = catalog.get(term_id)
+    item = {"id": term_id, "term": term["term"], "definition": term["definition"], "category": term["category"]}
+    if progress is not None:
+        card = progress.cards.get(term_id)
+        item["completed"] = term_id in progress.all_time_completed
+        item["due"] = date.fromordinal(card.due).isoformat() if card else None
+    return item
+
+
+def _parse_date(value):
+    if value is None:
+        return date.today()
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, "date는 YYYY-MM-DD 형식이어야 합니다")
+
+
+def _rewards_json(progress, month, rewards):
+    completions = progress.ledger.count(month)
+    awarded = progress.ledger.awarded(month)
+    return {
+        "month": month,
+        "completions": completions,
+        "rewards": [
+            {"count": count, "reward": rewards[count], "awarded_at": awarded.get(count)}
+            for count in sorted(rewards)
+        ],
+        "next": next_reward(completions, rewards),
+    }
+
+
+def create_app(terms_path=None, progress_path=None, store=None, rewards=REWARDS, api_token=None):
+    api_token = api_token if api_token is not None else os.environ.get("MEDTERM_API_TOKEN", "")
+    catalogs = CatalogCache(terms_path)
+    owns_store = store is None
+    if owns_store:
+        store = ProgressStore(
+            open_backend(progress_path or os.environ.get("MEDTERM_PROGRESS_PATH", DEFAULT_PROGRESS_PATH)),
+            rewards=rewards,
+        )
+
+    # 사용자 상태는 모두 저장소 잠금 안에서 읽는다 (완료 기록과 동시에 실행될 수 있음)
+    def today_terms(user_id, day):
+        catalog = catalogs.get()
+        # 오늘의 학습 화면과 같은 규칙으로 고르고 첫 요청 때 고정
+        term_ids = store.daily_terms(user_id, day, catalog)
+        with store.locked(user_id) as progress:
+            return {
+                "date": day.strftime("%Y-%m-%d"),
+                "terms": [_term_json(catalog, term_id, progress) for term_id in term_ids],
+                "completed": catalog.completed_count(progress.all_time_completed),
+                "total": len(catalog),
+            }
+
+    def complete_term(user_id, term_id, quality, day):
+        catalog = catalogs.get()
+        if term_id not in catalog:
+            raise ApiError(404, "알 수 없는 용어입니다")
+        with store.locked(user_id) as progress:
+            reviewed = store.review(user_id, term_id, quality, day, category=catalog.get(term_id)["category"])
+            # 같은 날 이미 복습한 카드면 기록하지 않고 현재 카드 상태를 돌려준다
+            card = reviewed or progress.cards[term_id]
+            return {
+                "reviewed": reviewed is not None,
+                "term": _term_json(catalog, term_id, progress),
+                "card": {"interval": card.interval, "ease": card.ease,
+                         "due": date.fromordinal(card.due).isoformat(), "reps": card.reps},
+                "completed": catalog.completed_count(progress.all_time_completed),
+                "rewards": _rewards_json(progress, month_key(datetime.now()), rewards),
+            }
+
+    def user_stats(user_id, day):
+        catalog = catalogs.get()
+        with store.locked(user_id) as progress:
+            rollup = progress.stats
+            return {
+                "completed": catalog.completed_count(progress.all_time_completed),
+                "total": len(catalog),
+                "this_month": progress.ledger.count(month_key(day)),
+                "reviews": rollup.total,
+                "daily": dict(zip(*rollup.recent_days(day))),
+                "weekly": dict(zip(*rollup.recent_weeks(day))),
+                "monthly": dict(zip(*rollup.recent_months(day))),
+                "categories": dict(rollup.top_categories().most_common()),
+            }
+
+    def user_rewards_json(user_id, day):
+        with store.locked(user_id) as progress:
+            return _rewards_json(progress, month_key(day), rewards)
+
+    def check_token(request):
+        if not api_token:
+            return
+        header = request.headers.get("authorization", "")
+        if not hmac.compare_digest(header.encode("utf-8"), f"Bearer {api_token}".encode("utf-8")):
+            raise ApiError(401, "인증 토큰이 필요합니다")
+
+    async def today(request):
+        check_token(request)
+        day = _parse_date(request.query_params.get("date"))
+        return JSONResponse(await run_in_threadpool(today_terms, request.path_params["user_id"], day))
+
+    async def complete(request):
+        check_token(request)
+        try:
+            body = await request.json()
+        except ValueError:
+            raise ApiError(400, "JSON 본문을 읽을 수 없습니다")
+        if not isinstance(body, dict):
+            raise ApiError(400, "JSON 객체가 필요합니다")
+        term_id = body.get("term_id")
+        quality = body.get("quality", QUALITY_GOOD)
+        # bool은 int의 하위 형식이므로 따로 거른다 (true가 용어 1로 처리되지 않게)
+        if not isinstance(term_id, int) or isinstance(term_id, bool):
+            raise ApiError(400, "term_id는 정수여야 합니다")
+        if not isinstance(quality, int) or isinstance(quality, bool) or not 0 <= quality <= 5:
+            raise ApiError(400, "quality는 0~5 사이 정수여야 합니다")
+        day = _parse_date(body.get("date"))
+        # 미래 날짜로 복습하면 카드의 다음 복습일이 미래로 밀리므로 받지 않는다
+        if day > date.today():
+            raise ApiError(400, "date는 오늘 이후일 수 없습니다")
+        return JSONResponse(
+            await run_in_threadpool(complete_term, request.path_params["user_id"], term_id, quality, day)
+        )
+
+    async def stats(request):
+        check_token(request)
+        day = _parse_date(request.query_params.get("date"))
+        return JSONResponse(await run_in_threadpool(user_stats, request.path_params["user_id"], day))
+
+    async def user_rewards(request):
+        check_token(request)
+        day = _parse_date(request.query_params.get("date"))
+        return JSONResponse(await run_in_threadpool(user_rewards_json, request.path_params["user_id"], day))
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "pending": store.pending_count(), "cached_users": store.cached_users()})
+
+    async def api_error(request, error):
+        return JSONResponse({"error": error.message}, status_code=error.status_code)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await run_in_threadpool(catalogs.get)
+        yield
+        if owns_store:
+            await run_in_threadpool(store.close)
+
+    app = Starlette(
+        routes=[
+            Route("/api/health", health),
+            Route("/api/users/{user_id}/today", today),
+            Route("/api/users/{user_id}/complete", complete, methods=["POST"]),
+            Route("/api/users/{user_id}/stats", stats),
+            Route("/api/users/{user_id}/rewards", user_rewards),
+        ],
+        exception_handlers={ApiError: api_error},
+        lifespan=lifespan,
+    )
+    app.state.store = store
+    app.state.catalogs = catalogs
+    return app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="의학 용어 학습 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--terms", default=None)
+    parser.add_argument("--progress", default=None)
+    args = parser.parse_args(argv)
+
+    # 연결은 이벤트 루프 하나가 모두 받는다 (keep-alive, 접근 로그는 끔)
+    uvicorn.run(
+        create_app(args.terms, args.progress),
+        host=args.host,
+        port=args.port,
+        access_log=False,
+        timeout_keep_alive=30,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
+import hmac
+import io
+import os
+import sys
+import zipfile
 import streamlit as st
-from datetime import datetime
+from datetime import date, datetime
 import pandas as pd
 import plotly.graph_objects as go
 from streamlit_option_menu import option_menu
 from streamlit_extras.card import card
-import random
+import term_store
+from accounts import DEFAULT_ACCOUNTS_PATH, load_accounts, verify_password
+from catalog import CATEGORY_SEP
+from cohort import CohortAggregator
+from profiling import NullProfiler, ProfileRegistry, RerunProfiler
+from progress_store import DEFAULT_PROGRESS_PATH, ProgressStore, open_backend
+from packs import DEFAULT_WEEKS, apply_sync, build_study_pack
+from quiz import DistractorPools, grade_round, make_round, quiz_rng
+from rewards import REWARDS, next_reward
+from search import SearchIndex
+from srs import QUALITY_GOOD, QUALITY_HARD
+from stats import month_key
+from templates import STYLE_PATH, TermCardTemplates, load_style, reward_cards, term_card_html
+from transfer import (
+    DAILY_FIELDS, IMPORT_FORMATS, PROGRESS_FIELDS, import_terms, iter_daily_records, iter_lines,
+    iter_progress_records, iter_records, write_lines,
+)
 
 # 페이지 설정
 st.set_page_config(
@@ -14,297 +35,43 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS 스타일 적용
-st.markdown("""
-    <style>
-    .main {
-        padding: 2rem;
-    }
-    .stButton > button {
-        width: 100%;
-        border-radius: 20px;
-        height: 3rem;
-        background: linear-gradient(45deg, #4F46E5, #7C3AED);
-        color: white;
-        font-weight: bold;
-    }
-    .term-card {
-        background: #f8f9fa;
-        color: #000;  /* 글자색 검정으로 지정 */
-        padding: 1.5rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 1rem;
-    }
-    .stats-card {
-        background: linear-gradient(45deg, #4F46E5, #7C3AED);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin-bottom: 1rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-# 의학 용어 데이터베이스 (총 180개)
-nested_terms = {
-    "기초 의학": {
-        "해부학": [
-            {"term": "Cerebrum", "definition": "대뇌"},
-            {"term": "Medulla Oblongata", "definition": "연수"},
-            {"term": "Cerebellum", "definition": "소뇌"},
-            {"term": "Hypothalamus", "definition": "시상하부"},
-            {"term": "Thalamus", "definition": "시상"},
-            {"term": "Pons", "definition": "뇌교"},
-            {"term": "Hippocampus", "definition": "해마"},
-            {"term": "Amygdala", "definition": "편도체"},
-            {"term": "Corpus Callosum", "definition": "뇌량"},
-            {"term": "Brainstem", "definition": "뇌간"},
-            # 추가 5개
-            {"term": "Frontal Lobe", "definition": "전두엽"},
-            {"term": "Parietal Lobe", "definition": "두정엽"},
-            {"term": "Temporal Lobe", "definition": "측두엽"},
-            {"term": "Occipital Lobe", "definition": "후두엽"},
-            {"term": "Basal Ganglia", "definition": "기저핵"}
-        ],
-        "생리학": [
-            {"term": "Homeostasis", "definition": "항상성"},
-            {"term": "Metabolism", "definition": "대사"},
-            {"term": "Osmosis", "definition": "삼투"},
-            {"term": "Diffusion", "definition": "확산"},
-            {"term": "Active Transport", "definition": "능동수송"},
-            {"term": "Membrane Potential", "definition": "막전위"},
-            {"term": "Action Potential", "definition": "활동전위"},
-            {"term": "Synapse", "definition": "시냅스"},
-            {"term": "Neurotransmitter", "definition": "신경전달물질"},
-            {"term": "Receptor", "definition": "수용체"},
-            # 추가 5개
-            {"term": "Hormone", "definition": "호르몬"},
-            {"term": "Enzyme", "definition": "효소"},
-            {"term": "pH Balance", "definition": "산-염기 균형"},
-            {"term": "Thermoregulation", "definition": "체온 조절"},
-            {"term": "Blood Pressure Regulation", "definition": "혈압 조절"}
-        ],
-        "조직학": [
-            {"term": "Epithelium", "definition": "상피조직"},
-            {"term": "Connective Tissue", "definition": "결합조직"},
-            {"term": "Muscle Tissue", "definition": "근육조직"},
-            {"term": "Nervous Tissue", "definition": "신경조직"},
-            {"term": "Adipose Tissue", "definition": "지방조직"},
-            {"term": "Cartilage", "definition": "연골"},
-            {"term": "Bone Tissue", "definition": "골조직"},
-            {"term": "Blood", "definition": "혈액"},
-            {"term": "Lymphatic Tissue", "definition": "림프조직"},
-            {"term": "Mucous Membrane", "definition": "점막"},
-            # 추가 5개
-            {"term": "Tendon", "definition": "힘줄"},
-            {"term": "Ligament", "definition": "인대"},
-            {"term": "Elastic Tissue", "definition": "탄력성 조직"},
-            {"term": "Reticular Tissue", "definition": "그물 조직"},
-            {"term": "Serous Membrane", "definition": "장막"}
-        ]
-    },
-    "임상 의학": {
-        "순환기": [
-            {"term": "Hypertension", "definition": "고혈압"},
-            {"term": "Tachycardia", "definition": "빈맥"},
-            {"term": "Bradycardia", "definition": "서맥"},
-            {"term": "Arrhythmia", "definition": "부정맥"},
-            {"term": "Myocardial Infarction", "definition": "심근경색"},
-            {"term": "Angina Pectoris", "definition": "협심증"},
-            {"term": "Heart Failure", "definition": "심부전"},
-            {"term": "Atherosclerosis", "definition": "동맥경화증"},
-            {"term": "Thrombosis", "definition": "혈전증"},
-            {"term": "Embolism", "definition": "색전증"},
-            # 추가 5개
-            {"term": "Cardiac Output", "definition": "심박출량"},
-            {"term": "Cardiomyopathy", "definition": "심근병증"},
-            {"term": "Valvular Heart Disease", "definition": "심장판막질환"},
-            {"term": "Peripheral Vascular Disease", "definition": "말초혈관질환"},
-            {"term": "Stroke Volume", "definition": "일회박출량"}
-        ],
-        "호흡기": [
-            {"term": "Dyspnea", "definition": "호흡곤란"},
-            {"term": "Bronchitis", "definition": "기관지염"},
-            {"term": "Pneumonia", "definition": "폐렴"},
-            {"term": "Emphysema", "definition": "폐기종"},
-            {"term": "Asthma", "definition": "천식"},
-            {"term": "Tuberculosis", "definition": "결핵"},
-            {"term": "Pleurisy", "definition": "흉막염"},
-            {"term": "Pneumothorax", "definition": "기흉"},
-            {"term": "Pulmonary Edema", "definition": "폐부종"},
-            {"term": "Lung Cancer", "definition": "폐암"},
-            # 추가 5개
-            {"term": "Chronic Bronchitis", "definition": "만성 기관지염"},
-            {"term": "Laryngitis", "definition": "후두염"},
-            {"term": "Bronchiectasis", "definition": "기관지확장증"},
-            {"term": "Pulmonary Fibrosis", "definition": "폐섬유화증"},
-            {"term": "Respiratory Distress Syndrome", "definition": "호흡곤란 증후군"}
-        ],
-        "소화기": [
-            {"term": "Gastritis", "definition": "위염"},
-            {"term": "Hepatitis", "definition": "간염"},
-            {"term": "Cholecystitis", "definition": "담낭염"},
-            {"term": "Pancreatitis", "definition": "췌장염"},
-            {"term": "Appendicitis", "definition": "충수염"},
-            {"term": "Cirrhosis", "definition": "간경변"},
-            {"term": "Peptic Ulcer", "definition": "소화성 궤양"},
-            {"term": "Crohn Disease", "definition": "크론병"},
-            {"term": "Ulcerative Colitis", "definition": "궤양성 대장염"},
-            {"term": "Gallstone", "definition": "담석"},
-            # 추가 5개
-            {"term": "Gastroparesis", "definition": "위마비"},
-            {"term": "Esophagitis", "definition": "식도염"},
-            {"term": "Diverticulitis", "definition": "게실염"},
-            {"term": "Gastroenteritis", "definition": "위장염"},
-            {"term": "Hemorrhoids", "definition": "치질(치핵)"}
-        ],
-        "신경계": {
-            "두뇌": [
-                {"term": "Anencephaly", "definition": "무뇌증"},
-                {"term": "Cerebral Palsy", "definition": "뇌성마비"},
-                {"term": "Meningitis", "definition": "수막염"},
-                {"term": "Brain Tumor", "definition": "뇌종양"},
-                {"term": "Epilepsy", "definition": "간질"},
-                {"term": "Encephalitis", "definition": "뇌염"},
-                {"term": "Hydrocephalus", "definition": "수두증"},
-                {"term": "Cerebral Hemorrhage", "definition": "뇌출혈"},
-                {"term": "Multiple Sclerosis", "definition": "다발성 경화증"},
-                {"term": "Brain Abscess", "definition": "뇌농양"},
-                # 추가 5개
-                {"term": "Parkinson's Disease", "definition": "파킨슨병"},
-                {"term": "Alzheimer's Disease", "definition": "알츠하이머병"},
-                {"term": "Subdural Hematoma", "definition": "경막하 혈종"},
-                {"term": "Concussion", "definition": "뇌진탕"},
-                {"term": "Transient Ischemic Attack", "definition": "일과성 허혈 발작"}
-            ],
-            "증상": [
-                {"term": "Aphasia", "definition": "실어증"},
-                {"term": "Apraxia", "definition": "실행증"},
-                {"term": "Ataxia", "definition": "운동실조"},
-                {"term": "Convulsion", "definition": "경련"},
-                {"term": "Dizziness", "definition": "어지러움"},
-                {"term": "Vertigo", "definition": "현기증"},
-                {"term": "Coma", "definition": "혼수"},
-                {"term": "Syncope", "definition": "실신"},
-                {"term": "Neuralgia", "definition": "신경통"},
-                {"term": "Paralysis", "definition": "마비"},
-                # 추가 5개
-                {"term": "Headache", "definition": "두통"},
-                {"term": "Insomnia", "definition": "불면증"},
-                {"term": "Neurogenic Shock", "definition": "신경인성 쇼크"},
-                {"term": "Spasm", "definition": "근육 경련"},
-                {"term": "Paresthesia", "definition": "감각 이상"}
-            ]
-        }
-    },
-    "이비인후과": {
-        "귀": [
-            {"term": "Otitis Media", "definition": "중이염"},
-            {"term": "Tinnitus", "definition": "이명"},
-            {"term": "Deafness", "definition": "난청"},
-            {"term": "Labyrinthitis", "definition": "미로염"},
-            {"term": "Acoustic Neuroma", "definition": "청신경종양"},
-            {"term": "Otosclerosis", "definition": "이경화증"},
-            {"term": "Vestibular Neuritis", "definition": "전정신경염"},
-            {"term": "Meniere Disease", "definition": "메니에르병"},
-            {"term": "Cochlear Implant", "definition": "인공와우"},
-            {"term": "Presbycusis", "definition": "노인성난청"},
-            # 추가 5개
-            {"term": "Ear Barotrauma", "definition": "이압손상"},
-            {"term": "Cholesteatoma", "definition": "진주종"},
-            {"term": "Otorrhea", "definition": "이루(귀액)"},
-            {"term": "Otalgia", "definition": "이통(귀 통증)"},
-            {"term": "Perforated Eardrum", "definition": "고막 천공"}
-        ],
-        "코": [
-            {"term": "Rhinitis", "definition": "비염"},
-            {"term": "Sinusitis", "definition": "부비동염"},
-            {"term": "Epistaxis", "definition": "비출혈"},
-            {"term": "Nasal Polyp", "definition": "비강폴립"},
-            {"term": "Deviated Septum", "definition": "비중격만곡증"},
-            {"term": "Anosmia", "definition": "후각상실"},
-            {"term": "Rhinorrhea", "definition": "콧물"},
-            {"term": "Nasal Obstruction", "definition": "비강폐쇄"},
-            {"term": "Allergic Rhinitis", "definition": "알레르기성 비염"},
-            {"term": "Nasal Trauma", "definition": "비부외상"},
-            # 추가 5개
-            {"term": "Nasopharyngitis", "definition": "비인두염"},
-            {"term": "Rhinosinusitis", "definition": "비부비동염"},
-            {"term": "Hyposmia", "definition": "후각저하"},
-            {"term": "Turbinate Hypertrophy", "definition": "코벌미비대"},
-            {"term": "Foreign Body in Nose", "definition": "코 이물"}
-        ]
-    },
-    "비뇨기과": {
-        "신장": [
-            {"term": "Nephritis", "definition": "신장염"},
-            {"term": "Renal Failure", "definition": "신부전"},
-            {"term": "Nephrotic Syndrome", "definition": "신증후군"},
-            {"term": "Pyelonephritis", "definition": "신우신염"},
-            {"term": "Hydronephrosis", "definition": "수신증"},
-            {"term": "Renal Cyst", "definition": "신낭종"},
-            {"term": "Glomerulonephritis", "definition": "사구체신염"},
-            {"term": "Kidney Stone", "definition": "신장결석"},
-            {"term": "Renal Cancer", "definition": "신장암"},
-            {"term": "Polycystic Kidney", "definition": "다낭성신장"},
-            # 추가 5개
-            {"term": "Nephroblastoma", "definition": "신아세포종(윌름스 종양)"},
-            {"term": "Renal Artery Stenosis", "definition": "신동맥협착증"},
-            {"term": "Renal Colic", "definition": "신산통"},
-            {"term": "Renal Hypertension", "definition": "신성고혈압"},
-            {"term": "Renal Osteodystrophy", "definition": "신성골이영양증"}
-        ],
-        "방광": [
-            {"term": "Cystitis", "definition": "방광염"},
-            {"term": "Urinary Retention", "definition": "요저류"},
-            {"term": "Incontinence", "definition": "요실금"},
-            {"term": "Bladder Cancer", "definition": "방광암"},
-            {"term": "Overactive Bladder", "definition": "과민성방광"},
-            {"term": "Neurogenic Bladder", "definition": "신경인성방광"},
-            {"term": "Urethritis", "definition": "요도염"},
-            {"term": "Urinary Tract Infection", "definition": "요로감염"},
-            {"term": "Bladder Stone", "definition": "방광결석"},
-            {"term": "Interstitial Cystitis", "definition": "간질성방광염"},
-            # 추가 5개
-            {"term": "Bladder Neck Obstruction", "definition": "방광경부폐색"},
-            {"term": "Bladder Fistula", "definition": "방광루"},
-            {"term": "Bladder Diverticulum", "definition": "방광게실"},
-            {"term": "Dysuria", "definition": "배뇨통"},
-            {"term": "Benign Prostatic Hyperplasia", "definition": "양성 전립선 비대증(비뇨기과적 문제)"}
-        ]
-    }
-}
+# 성능 측정 (MEDTERM_PROFILE=1이면 모든 rerun, 강사는 주소에 ?profile=1 을 붙여 켤 수 있음)
+PROFILE_DIR = os.environ.get(
+    "MEDTERM_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profile")
+)
+
+
+@st.cache_resource
+def get_profile_registry(export_dir):
+    return ProfileRegistry(export_dir)
+
+
+PROFILE_ALL = os.environ.get("MEDTERM_PROFILE") == "1"
+if PROFILE_ALL or st.query_params.get("profile") == "1":
+    # ?profile=1은 강사인지 확인한 뒤에 누적 통계에 넣을지 정하므로 그때까지는 구간만 모은다
+    profiler = RerunProfiler(get_profile_registry(PROFILE_DIR) if PROFILE_ALL else None)
+else:
+    profiler = NullProfiler()
+
+# CSS 스타일 적용 (static/style.css를 줄여 프로세스당 한 번만 읽음)
+@st.cache_resource
+def get_style(path, mtime):
+    return load_style(path)
 
-# 중첩된 딕셔너리를 단일 리스트로 변환
-def flatten_terms(nested_dict):
-    flat_list = []
-    for val in nested_dict.values():
-        if isinstance(val, dict):
-            flat_list.extend(flatten_terms(val))
-        elif isinstance(val, list):
-            flat_list.extend(val)
-    return flat_list
-
-medical_terms = flatten_terms(nested_terms)
-
-# 세션 상태 초기화
-if "completed_terms" not in st.session_state:
-    st.session_state.completed_terms = []
-if "monthly_completions" not in st.session_state:
-    st.session_state.monthly_completions = 0
-if "all_time_completed" not in st.session_state:
-    st.session_state.all_time_completed = []
-# 날짜별로 뽑힌 6개 용어 저장용(딕셔너리: {날짜(str): [용어6개]})
-if "daily_terms" not in st.session_state:
-    st.session_state.daily_terms = {}
+
+st.markdown(get_style(STYLE_PATH, os.path.getmtime(STYLE_PATH)), unsafe_allow_html=True)
+profiler.lap("css")
 
 # 사이드바 메뉴
 with st.sidebar:
     menu_options = {
         "오늘의 학습": "book",
         "통계": "graph-up",
-        "상품 시스템": "gift"
+        "상품 시스템": "gift",
+        "용어 검색": "search",
+        "퀴즈": "patch-question",
+        "데이터 관리": "arrow-down-up",
+        "코호트 대시보드": "people"
     }
     selected = option_menu(
         "학습 메뉴",
@@ -314,6 +81,199 @@ with st.sidebar:
         default_index=0,
     )
 
+# 의학 용어 데이터베이스 (외부 파일에서 읽어 프로세스 전역 캐시에 보관)
+# (MEDTERM_TERMS_PATH, 없으면 가져오기로 만든 작업용 덱, 그것도 없으면 기본 용어 파일)
+TERMS_PATH = term_store.default_terms_path()
+# 화면에서 가져올 수 있는 파일 크기 (업로드 파일은 메모리에 올라오므로 큰 파일은
+# python transfer.py import 로 한 줄씩 가져온다)
+UI_IMPORT_MAX_BYTES = 20 * 1024 * 1024
+
+
+# 파일 수정 시각(mtime)을 캐시 키에 포함해 파일이 바뀌면 다시 읽음
+@st.cache_resource(max_entries=8)
+def get_categories(path, mtime):
+    return term_store.list_categories(path)
+
+
+@st.cache_resource(max_entries=8)
+def get_catalog(path, mtime, categories=None):
+    return term_store.load_catalog(path, categories)
+
+
+# 검색 인덱스는 전체 카탈로그로 파일 버전마다 한 번만 만들고, 학습 범위는 결과에서 거른다
+# (범위 조합마다 만들면 큰 덱에서 수 초씩 걸리고 서로 캐시에서 밀어냄)
+@st.cache_resource(max_entries=2)
+def get_search_index(path, mtime, _catalog):
+    return SearchIndex(_catalog)
+
+
+# 용어 카드 HTML도 전체 카탈로그 하나로 만든다
+@st.cache_resource(max_entries=2)
+def get_card_templates(path, mtime, _catalog):
+    return TermCardTemplates(_catalog)
+
+
+@st.cache_resource
+def get_reward_cards():
+    return reward_cards()
+
+
+# 퀴즈 오답 보기 후보도 전체 카탈로그로 한 번만 만든다 (보기는 같은 카테고리에서 뽑으므로 범위와 무관)
+@st.cache_resource(max_entries=2)
+def get_distractor_pools(path, mtime, _catalog):
+    return DistractorPools(_catalog)
+
+
+terms_mtime = os.path.getmtime(TERMS_PATH)
+all_categories = get_categories(TERMS_PATH, terms_mtime)
+with st.sidebar:
+    study_categories = st.multiselect("학습 범위", all_categories, default=all_categories)
+if study_categories and len(study_categories) < len(all_categories):
+    catalog_key = (TERMS_PATH, terms_mtime, tuple(study_categories))
+else:
+    catalog_key = (TERMS_PATH, terms_mtime, None)
+catalog = get_catalog(*catalog_key)
+# 범위와 상관없는 기록(고정된 날짜, 내보내기, 동기화)은 전체 카탈로그로 확인
+full_catalog = get_catalog(TERMS_PATH, terms_mtime)
+profiler.lap("catalog")
+
+# 학습 진행 상황 저장소 (SQLite 기본, 완료 기록은 모았다가 일괄 저장)
+PROGRESS_PATH = os.environ.get("MEDTERM_PROGRESS_PATH", DEFAULT_PROGRESS_PATH)
+# 다중 사용자 모드: 아이디별로 학습 상태를 분리 (세션에는 로그인한 아이디만 보관)
+# 계정은 강사가 python accounts.py add <아이디>로 만들고, 비밀번호는 로그인할 때 한 번만 확인한다
+MULTI_USER = os.environ.get("MEDTERM_MULTI_USER", "") == "1"
+ACCOUNTS_PATH = os.environ.get("MEDTERM_ACCOUNTS_PATH", DEFAULT_ACCOUNTS_PATH)
+
+
+@st.cache_resource(max_entries=2)
+def get_accounts(path, mtime):
+    return load_accounts(path)
+
+
+def logout():
+    st.session_state.pop("login_user", None)
+
+
+if MULTI_USER:
+    accounts = get_accounts(
+        ACCOUNTS_PATH, os.path.getmtime(ACCOUNTS_PATH) if os.path.exists(ACCOUNTS_PATH) else None
+    )
+    USER_ID = st.session_state.get("login_user")
+    # 로그인 전이거나 계정이 삭제된 경우
+    if USER_ID not in accounts:
+        if not accounts:
+            st.error("등록된 계정이 없습니다. 강사가 python accounts.py add <아이디>로 계정을 만들어야 합니다.")
+            st.stop()
+        with st.sidebar.form("login"):
+            login_id = st.text_input("학번 / 아이디").strip()
+            password = st.text_input("비밀번호", type="password")
+            submitted = st.form_submit_button("로그인")
+        if submitted:
+            if verify_password(accounts, login_id, password):
+                st.session_state.login_user = login_id
+                st.rerun()
+            st.error("아이디 또는 비밀번호가 올바르지 않습니다.")
+        st.info("사이드바에서 로그인하면 학습을 시작할 수 있습니다.")
+        st.stop()
+    with st.sidebar:
+        st.caption(f"{USER_ID} 로그인 중")
+        st.button("로그아웃", on_click=logout)
+else:
+    USER_ID = "local"
+# 강사 기능(용어 가져오기, 코호트 대시보드) 권한
+# 다중 사용자 모드에서는 MEDTERM_INSTRUCTORS에 적힌 아이디(비워 두면 모든 아이디)로 로그인한 뒤
+# MEDTERM_INSTRUCTOR_PASSWORD와 같은 강사 비밀번호를 한 번 더 입력해야 한다.
+# 강사 비밀번호를 설정하지 않으면 강사 기능은 꺼진다.
+INSTRUCTOR_IDS = {
+    user_id.strip() for user_id in os.environ.get("MEDTERM_INSTRUCTORS", "").split(",") if user_id.strip()
+}
+INSTRUCTOR_PASSWORD = os.environ.get("MEDTERM_INSTRUCTOR_PASSWORD", "")
+if not MULTI_USER:
+    IS_INSTRUCTOR = True
+elif INSTRUCTOR_PASSWORD and (not INSTRUCTOR_IDS or USER_ID in INSTRUCTOR_IDS):
+    with st.sidebar:
+        entered_password = st.text_input("강사 비밀번호", type="password", key="instructor_password")
+    IS_INSTRUCTOR = bool(entered_password) and hmac.compare_digest(
+        entered_password.encode("utf-8"), INSTRUCTOR_PASSWORD.encode("utf-8")
+    )
+else:
+    IS_INSTRUCTOR = False
+# ?profile=1은 강사만 (프로세스 전체 지표와 내보내기 경로가 보이고 누적 통계에 합산됨)
+if profiler.enabled and not PROFILE_ALL:
+    if IS_INSTRUCTOR:
+        profiler.registry = get_profile_registry(PROFILE_DIR)
+    else:
+        profiler = NullProfiler()
+
+
+@st.cache_resource
+def get_progress_store(path):
+    return ProgressStore(open_backend(path))
+
+
+progress_store = get_progress_store(PROGRESS_PATH)
+
+
+# 코호트 집계 작업자는 프로세스당 하나 (처음 대시보드를 열 때 시작)
+@st.cache_resource
+def get_cohort_aggregator(path):
+    return CohortAggregator(get_progress_store(path).backend)
+
+
+# 완료 상태는 용어 id 집합으로 관리 (사용자별 메모리 캐시에서 읽음)
+user_progress = progress_store.get(USER_ID)
+profiler.lap("progress")
+
+
+MONTHLY_GOAL = 30
+
+
+# 통계 그래프는 사용자별 집계 버전(version)이 바뀔 때만 새로 만든다
+# _series는 저장소 잠금 안에서 떠 둔 값 (그래프는 잠금 밖에서 만듦)
+# goal: 이번 달 완료 수, category_tree: 카테고리별 (경로, 완료 수, 전체 수), 나머지: (라벨, 값) 목록
+@st.cache_resource(max_entries=512)
+def build_stats_figure(user_id, kind, version, today, _series):
+    if kind == "goal":
+        fig = go.Figure(data=[
+            go.Bar(name="완료", y=[_series], marker_color="#4F46E5"),
+            go.Bar(name="목표", y=[MONTHLY_GOAL], marker_color="#7C3AED")
+        ])
+        fig.update_layout(
+            barmode='group',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    if kind == "category_tree":
+        fig = go.Figure(go.Sunburst(
+            ids=[CATEGORY_SEP.join(path) for path, _, _ in _series],
+            labels=[path[-1] for path, _, _ in _series],
+            parents=[CATEGORY_SEP.join(path[:-1]) for path, _, _ in _series],
+            values=[total for _, _, total in _series],
+            branchvalues="total",
+            marker=dict(
+                colors=[done / total for _, done, total in _series],
+                colorscale=[[0, "#f8f9fa"], [1, "#4F46E5"]],
+                cmin=0,
+                cmax=1,
+            ),
+            customdata=[[done, total] for _, done, total in _series],
+            hovertemplate="%{label}<br>%{customdata[0]}/%{customdata[1]}<extra></extra>",
+        ))
+        fig.update_layout(
+            margin=dict(t=0, l=0, r=0, b=0),
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    labels, values = _series
+    fig = go.Figure(data=[go.Bar(x=labels, y=values, marker_color="#4F46E5")])
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
 # 오늘의 학습 페이지
 if selected == list(menu_options.keys())[0]:  # "오늘의 학습"
     st.title("🏥 오늘의 의학 용어")
@@ -323,135 +283,386 @@ if selected == list(menu_options.keys())[0]:  # "오늘의 학습"
     with col1:
         selected_date = st.date_input("학습 날짜 선택", datetime.now())
     
-    # 문자열 형태로 키를 사용(날짜별)
-    date_key = selected_date.strftime("%Y-%m-%d")
-
-    # date_key에 해당하는 6개 용어가 없다면 새로 뽑음
-    if date_key not in st.session_state.daily_terms:
-        # 남아있는 용어 중 6개 또는 전체에서 재추출
-        remaining_terms = [term for term in medical_terms 
-                           if term not in st.session_state.all_time_completed]
-        if len(remaining_terms) < 6:
-            sample_pool = medical_terms  # 전체 중에서 추출
-        else:
-            sample_pool = remaining_terms
-        
-        # 오늘의 6개 용어 고정
-        st.session_state.daily_terms[date_key] = random.sample(sample_pool, 6)
-
-    # 오늘의 용어 가져오기
-    today_terms = st.session_state.daily_terms[date_key]
-
-    # 전체 진행률 표시
-    progress = len(st.session_state.all_time_completed) / len(medical_terms)
-    st.progress(progress)
-    st.write(
-        f"전체 진행률: {progress*100:.1f}% "
-        f"({len(st.session_state.all_time_completed)}/{len(medical_terms)})"
-    )
+    # 완료 / 어려워요 처리는 버튼 콜백에서 (조각을 다시 그리기 전에 기록이 반영됨)
+    # 복습일은 항상 오늘 (선택한 날짜는 어느 날의 용어를 보여 줄지만 정함)
+    def record_review(term_id, quality):
+        card = progress_store.review(
+            USER_ID, term_id, quality, date.today(), category=catalog.get(term_id)["category"]
+        )
+        if card is not None:
+            st.session_state["review_feedback"] = quality
+
+    # 진행률과 카드만 다시 그리는 조각 (버튼을 눌러도 페이지 전체를 다시 실행하지 않음)
+    # 조각만 다시 실행될 때도 다른 탭의 초기화나 캐시 교체가 반영되도록 상태는 매번 저장소에서 읽는다
+    @st.fragment
+    def today_cards(selected_date):
+        feedback = st.session_state.pop("review_feedback", None)
+        if feedback == QUALITY_GOOD:
+            st.toast("잘 하셨습니다! 🎉")
+        elif feedback == QUALITY_HARD:
+            st.toast("내일 다시 복습합니다.")
+
+        # 선택한 날짜의 6개 용어 (없으면 학습 범위에서 새로 구성해 고정:
+        # 복습 예정 카드 우선, 나머지는 사용자별 고정 스케줄의 새 용어)
+        date_key = selected_date.strftime("%Y-%m-%d")
+        daily_ids = progress_store.daily_terms(USER_ID, selected_date, catalog, full_catalog)
+        # 고정된 용어 중 현재 학습 범위에 있는 것만 보여 줌 (고정 기록은 그대로 둠)
+        term_ids = [term_id for term_id in daily_ids if term_id in catalog]
+        with progress_store.locked(USER_ID) as state:
+            progress = catalog.progress(state.all_time_completed)
+            completed = catalog.completed_count(state.all_time_completed)
+            card_states = {term_id: state.cards.get(term_id) for term_id in term_ids}
+
+        # 전체 진행률 표시
+        st.progress(progress)
+        st.write(f"전체 진행률: {progress*100:.1f}% ({completed}/{len(catalog)})")
+
+        # 카드 표시 (영어+한글, 굵게 / HTML은 카탈로그별 캐시에서 읽음)
+        card_templates = get_card_templates(TERMS_PATH, terms_mtime, full_catalog)
+        if not term_ids:
+            st.info("이 날짜의 용어는 선택한 학습 범위에 없습니다.")
+        cols = st.columns(3)
+        for idx, term_id in enumerate(term_ids):
+            with cols[idx % 3]:
+                card_key = f"term_card_{date_key}_{idx}"
+                st.markdown(card_templates.card(term_id), unsafe_allow_html=True)
+
+                card_state = card_states[term_id]
+                if card_state is not None:
+                    st.caption(f"다음 복습: {date.fromordinal(card_state.due):%Y-%m-%d}")
+                # 오늘 이미 복습한 카드는 버튼을 잠금 (하루 한 번만 복습)
+                reviewed = card_state is not None and card_state.last_review >= date.today().toordinal()
+
+                # 완료 / 어려워요 버튼 (간격 반복 복습 결과로 기록)
+                done_col, hard_col = st.columns(2)
+                with done_col:
+                    st.button(
+                        "완료", key=card_key, disabled=reviewed,
+                        on_click=record_review, args=(term_id, QUALITY_GOOD),
+                    )
+                with hard_col:
+                    st.button(
+                        "어려워요", key=f"{card_key}_hard", disabled=reviewed,
+                        on_click=record_review, args=(term_id, QUALITY_HARD),
+                    )
 
-    # 카드 표시 (영어+한글, 굵게)
-    cols = st.columns(3)
-    for idx, term in enumerate(today_terms):
-        with cols[idx % 3]:
-            card_key = f"term_card_{date_key}_{idx}"
-            st.markdown(f"""
-            <div class="term-card">
-                <p style="font-weight:bold; font-size:1.1rem;">{term['term']}</p>
-                <p style="font-weight:bold; font-size:1rem;">{term['definition']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # 완료 버튼
-            if st.button("완료", key=card_key):
-                if term not in st.session_state.completed_terms:
-                    st.session_state.completed_terms.append(term)
-                if term not in st.session_state.all_time_completed:
-                    st.session_state.all_time_completed.append(term)
-                    st.session_state.monthly_completions += 1
-
-                st.success("잘 하셨습니다! 🎉")
-                # 풍선 대신 눈 이펙트 사용 (더 작아 글자 가림이 덜 함)
-                st.snow()
+    today_cards(selected_date)
+    profiler.lap("오늘의 학습/cards")
 
 # 통계 페이지
 elif selected == list(menu_options.keys())[1]:  # "통계"
     st.title("📊 학습 통계")
     
-    # 월간 완료 통계
+    today = date.today()
+    this_month = month_key(today)
+    kinds = ["daily", "weekly", "monthly", "category"]
+    # 다른 탭의 완료 기록이 집계를 바꾸는 도중에 읽지 않도록 집계 값만 잠금 안에서 떠 둔다
+    with progress_store.locked(USER_ID) as progress:
+        version = progress.stats.version
+        series = {kind: progress.stats.series(kind, today) for kind in kinds}
+        monthly_count = progress.ledger.count(this_month)
+        total_progress = catalog.completed_count(progress.all_time_completed)
+        # 완료 집합은 초기화할 때만 줄어들므로 (집계 버전, 완료 수)가 같으면 카테고리 현황도 같다
+        tree_version = (catalog_key, version, len(progress.all_time_completed))
+        category_rows = catalog.category_progress(progress.all_time_completed)
+
+    # 월간 완료 통계 (이번 달 장부)
     st.subheader("월간 완료 현황")
-    monthly_data = pd.DataFrame({
-        "완료 횟수": [st.session_state.monthly_completions],
-        "목표": [30]
-    })
-    
-    fig = go.Figure(data=[
-        go.Bar(name="완료", y=monthly_data["완료 횟수"], marker_color="#4F46E5"),
-        go.Bar(name="목표", y=monthly_data["목표"], marker_color="#7C3AED")
-    ])
-    
-    fig.update_layout(
-        barmode='group',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+    st.plotly_chart(
+        build_stats_figure(USER_ID, "goal", (this_month, monthly_count), today, monthly_count),
+        use_container_width=True,
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    profiler.lap("통계/monthly")
+
+    # 기간별 · 카테고리별 완료 현황 (완료 이벤트 집계에서 바로 읽음)
+    st.subheader("기간별 학습 기록")
+    tabs = st.tabs(["일별", "주별", "월별", "카테고리별"])
+    for tab, kind in zip(tabs, kinds):
+        with tab:
+            st.plotly_chart(build_stats_figure(USER_ID, kind, version, today, series[kind]), use_container_width=True)
+    profiler.lap("통계/rollups")
 
     # 전체 진행 현황
     st.subheader("전체 진행 현황")
-    total_progress = len(st.session_state.all_time_completed)
-    total_terms = len(medical_terms)
+    total_terms = len(catalog)
     st.metric(
         "학습한 용어 수",
         f"{total_progress}/{total_terms}",
         f"{(total_progress/total_terms*100):.1f}%"
     )
 
+    # 카테고리별 진행 현황 (카탈로그의 카테고리 경로 인덱스로 노드 수에 비례해 계산)
+    st.subheader("카테고리별 진행 현황")
+    st.plotly_chart(
+        build_stats_figure(USER_ID, "category_tree", tree_version, today, category_rows),
+        use_container_width=True,
+    )
+    profiler.lap("통계/categories")
+
 # 상품 시스템 페이지
 elif selected == list(menu_options.keys())[2]:  # "상품 시스템"
     st.title("🎁 상품 시스템")
     
-    rewards = {
-        10: "귀여운 메모지 세트",
-        15: "프리미엄 노트",
-        20: "스터디 플래너",
-        25: "고급 만년필 세트",
-        30: "프리미엄 학습 키트"
-    }
-    
-    for count, reward in rewards.items():
-        achieved = st.session_state.monthly_completions >= count
-        container_class = "stats-card" if achieved else "term-card"
-        status_text = "획득 완료! 🎉" if achieved else "아직 획득하지 못했습니다"
-        
-        st.markdown(f"""
-        <div class="{container_class}">
-            <h3>{count}회 완료 - {reward}</h3>
-            <p>{status_text}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # 이번 달 장부의 획득 기록을 읽음 (달이 바뀌면 새 달 장부로 다시 시작)
+    this_month = month_key(date.today())
+    awarded = user_progress.ledger.awarded(this_month)
+
+    # 상품 카드 HTML은 달성 / 미달성 두 가지를 미리 만들어 둔 것 중에서 고름
+    cards = get_reward_cards()
+    for count in sorted(REWARDS):
+        st.markdown(cards[count][count in awarded], unsafe_allow_html=True)
+        if count in awarded:
+            st.caption(f"{awarded[count][:10]} 획득")
 
     # 현재 달성 현황
-    current_completions = st.session_state.monthly_completions
-    next_reward = next(
-        (count for count in sorted(rewards.keys()) if count > current_completions),
-        None
-    )
-    if next_reward:
-        remaining = next_reward - current_completions
+    current_completions = user_progress.ledger.count(this_month)
+    next_count = next_reward(current_completions)
+    if next_count:
+        remaining = next_count - current_completions
         st.info(f"다음 상품까지 {remaining}회 남았습니다! 화이팅! 💪")
+    profiler.lap("상품 시스템")
+
+# 용어 검색 페이지
+elif selected == list(menu_options.keys())[3]:  # "용어 검색"
+    st.title("🔍 용어 검색")
+
+    query = st.text_input("영어 용어 또는 한글 뜻으로 검색", placeholder="예: hypertension, 고혈압")
+    if query:
+        search_index = get_search_index(TERMS_PATH, terms_mtime, full_catalog)
+        results = search_index.search(query, include=None if catalog is full_catalog else catalog.__contains__)
+        if not results:
+            st.info("검색 결과가 없습니다.")
+        for term_id, _ in results:
+            term = catalog.get(term_id)
+            status_text = " 학습 완료 ✅" if term_id in user_progress.all_time_completed else ""
+            st.markdown(
+                term_card_html(term, status_text, catalog.term_path(term_id)),
+                unsafe_allow_html=True,
+            )
+    profiler.lap("용어 검색")
+
+# 퀴즈 페이지
+elif selected == list(menu_options.keys())[4]:  # "퀴즈"
+    st.title("📝 용어 퀴즈")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        n_questions = st.selectbox("문제 수", [5, 10, 20])
+    with col2:
+        quiz_code = st.text_input("시험 코드 (같은 코드를 입력한 학생은 같은 문제를 풉니다)").strip()
+
+    # 한 회차 문제를 한 번에 만들어 세션에 보관 (복습 예정 카드 우선, 나머지는 무작위)
+    quiz_round = st.session_state.get("quiz_round")
+    if (
+        st.button("새 퀴즈 시작")
+        or quiz_round is None
+        or any(question.term_id not in catalog for question in quiz_round)
+    ):
+        rng = quiz_rng(quiz_code)
+        count = min(n_questions, len(catalog))
+        if quiz_code:
+            term_ids = rng.sample(catalog.ids, count)
+        else:
+            term_ids = user_progress.due_index.due_terms(date.today(), count, include=catalog.__contains__)
+            picked = set(term_ids)
+            term_ids += [term_id for term_id in rng.sample(catalog.ids, count) if term_id not in picked]
+            term_ids = term_ids[:count]
+        quiz_round = make_round(get_distractor_pools(TERMS_PATH, terms_mtime, full_catalog), term_ids, rng)
+        st.session_state.quiz_round = quiz_round
+        st.session_state.quiz_round_no = st.session_state.get("quiz_round_no", 0) + 1
+        st.session_state.quiz_graded = None
+    round_no = st.session_state.quiz_round_no
+
+    # 답안은 폼으로 모아 제출할 때 한 번만 rerun
+    with st.form(f"quiz_form_{round_no}"):
+        answers = []
+        for idx, question in enumerate(quiz_round):
+            options = [catalog.get(choice)["definition"] for choice in question.choices]
+            selected_option = st.radio(
+                f"{idx + 1}. {catalog.get(question.term_id)['term']}",
+                options,
+                index=None,
+                key=f"quiz_{round_no}_{idx}",
+            )
+            answers.append(None if selected_option is None else options.index(selected_option))
+        submitted = st.form_submit_button("제출하고 채점하기")
+
+    # 채점 결과는 회차마다 한 번만 복습 기록에 반영
+    if submitted and st.session_state.quiz_graded is None:
+        score, results = grade_round(quiz_round, answers)
+        today = date.today()
+        for question, correct in zip(quiz_round, results):
+            progress_store.review(
+                USER_ID, question.term_id, QUALITY_GOOD if correct else QUALITY_HARD, today,
+                category=catalog.get(question.term_id)["category"],
+            )
+        st.session_state.quiz_graded = (score, results)
+
+    if st.session_state.quiz_graded is not None:
+        score, results = st.session_state.quiz_graded
+        st.metric("점수", f"{score}/{len(quiz_round)}")
+        for question, correct in zip(quiz_round, results):
+            if not correct:
+                st.markdown(
+                    term_card_html(catalog.get(question.term_id), label="정답: "), unsafe_allow_html=True
+                )
+    profiler.lap("퀴즈")
+
+# 데이터 관리 페이지
+elif selected == list(menu_options.keys())[5]:  # "데이터 관리"
+    st.title("💾 데이터 관리")
+
+    export_tab, import_tab, pack_tab = st.tabs(["학습 기록 내보내기", "용어 가져오기", "오프라인 학습팩"])
+    with export_tab:
+        export_kind = st.radio("내보낼 기록", ["학습 진행 상황", "날짜별 학습 기록"], horizontal=True)
+        export_format = st.radio("형식", IMPORT_FORMATS, horizontal=True, key="export_format")
+        if st.button("내보내기 파일 만들기"):
+            # 기록은 한 줄씩 변환해 쓴다 (다운로드 버튼은 내용 전체가 필요하므로 버퍼에 모음,
+            # 파일로 바로 내보내려면 python transfer.py export 사용)
+            if export_kind == "학습 진행 상황":
+                records, fields = iter_progress_records(progress_store, full_catalog, USER_ID), PROGRESS_FIELDS
+            else:
+                records, fields = iter_daily_records(progress_store, full_catalog, USER_ID), DAILY_FIELDS
+            export_file = io.BytesIO()
+            text_file = io.TextIOWrapper(export_file, encoding="utf-8", newline="")
+            write_lines(iter_lines(records, fields, export_format), text_file)
+            text_file.flush()
+            text_file.detach()
+            export_file.seek(0)
+            st.download_button(
+                "다운로드",
+                export_file,
+                file_name=f"{USER_ID}_{'progress' if export_kind == '학습 진행 상황' else 'daily'}.{export_format}",
+                mime="text/csv" if export_format == "csv" else "application/x-ndjson",
+            )
+
+    with import_tab:
+        if not IS_INSTRUCTOR:
+            st.info("용어 가져오기는 강사 비밀번호를 입력한 강사 계정만 사용할 수 있습니다.")
+        else:
+            st.caption("CSV는 category, term, definition 열, JSON Lines는 같은 키를 사용합니다. "
+                       f"카테고리 경로는 '{CATEGORY_SEP}'로 구분합니다 (예: 임상 의학{CATEGORY_SEP}순환기). "
+                       f"{UI_IMPORT_MAX_BYTES // (1024 * 1024)}MB보다 큰 파일은 서버에서 "
+                       "python transfer.py import 로 가져옵니다.")
+            uploaded = st.file_uploader("용어 파일", type=["csv", "jsonl"])
+            if uploaded is not None and uploaded.size > UI_IMPORT_MAX_BYTES:
+                st.error("파일이 너무 큽니다. 서버에서 python transfer.py import 로 가져와 주세요.")
+            elif uploaded is not None and st.button("가져오기"):
+                import_format = "jsonl" if uploaded.name.endswith(".jsonl") else "csv"
+                # 기본 용어 파일(git 관리) 대신 작업용 덱에 덧붙인다 (MEDTERM_TERMS_PATH를 지정했으면 그 파일)
+                report = import_terms(
+                    io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline=""), fmt=import_format
+                )
+                st.success(f"추가 {report.added}개, 중복 {report.duplicates}개, 오류 {report.invalid}개")
+                for error in report.errors:
+                    st.caption(error)
+
+    with pack_tab:
+        # 현재 학습 범위의 카테고리 묶음과 주별 스케줄 묶음 (압축 파일 그대로 zip에 담음)
+        st.caption("인터넷이 느린 곳에서도 학습할 수 있도록 용어와 앞으로의 오늘의 학습 스케줄을 "
+                   "미리 받아 둡니다. 오프라인에서 남긴 기록은 나중에 올려 한 번에 반영합니다.")
+        pack_weeks = st.number_input("스케줄 기간 (주)", min_value=1, max_value=16, value=DEFAULT_WEEKS)
+        if st.button("학습팩 만들기"):
+            pack_file = io.BytesIO()
+            with zipfile.ZipFile(pack_file, "w", zipfile.ZIP_STORED) as archive:
+                for filename, data in build_study_pack(catalog, progress_store, USER_ID, date.today(), pack_weeks):
+                    archive.writestr(filename, data)
+            pack_file.seek(0)
+            st.download_button(
+                "학습팩 다운로드", pack_file, file_name=f"{USER_ID}_pack.zip", mime="application/zip"
+            )
+
+        outbox = st.file_uploader("오프라인 기록 (JSON Lines: term_id, quality, reviewed_at)", type=["jsonl"])
+        if outbox is not None and st.button("기록 동기화"):
+            report = apply_sync(
+                progress_store, full_catalog, USER_ID,
+                iter_records(io.TextIOWrapper(outbox, encoding="utf-8"), "jsonl"),
+            )
+            st.success(
+                f"반영 {report.applied}개, 이미 반영됨 {report.stale}개, "
+                f"중복 {report.duplicates}개, 오류 {report.invalid}개"
+            )
+            for error in report.errors:
+                st.caption(error)
+    profiler.lap("데이터 관리")
+
+# 코호트 대시보드 페이지 (강사용, 백그라운드에서 미리 집계한 스냅샷만 읽음)
+elif selected == list(menu_options.keys())[6]:  # "코호트 대시보드"
+    st.title("👩‍🏫 코호트 대시보드")
+
+    if not IS_INSTRUCTOR:
+        st.info("코호트 대시보드는 강사 비밀번호를 입력한 강사 계정만 볼 수 있습니다.")
+    else:
+        aggregator = get_cohort_aggregator(PROGRESS_PATH)
+        if st.button("지금 다시 집계"):
+            aggregator.refresh()
+        snapshot = aggregator.latest
+        if aggregator.last_error is not None:
+            st.warning(f"최근 집계에 실패했습니다: {aggregator.last_error}")
+        if snapshot is None:
+            st.info("첫 집계를 준비하고 있습니다. 잠시 후 다시 열어 주세요.")
+        else:
+            st.caption(
+                f"집계 시각: {snapshot.built_at:%Y-%m-%d %H:%M:%S} "
+                f"(집계 소요 {snapshot.elapsed * 1000:.0f}ms, 최대 {aggregator.interval:.0f}초 전 데이터)"
+            )
+            col1, col2, col3 = st.columns(3)
+            col1.metric("학습자 수", len(snapshot.users))
+            col2.metric("평균 완료 용어 수", f"{snapshot.users['completed'].mean():.1f}" if len(snapshot.users) else "0")
+            col3.metric("상품 1단계 이상", int((snapshot.users["reward_tier"] > 0).sum()))
+
+            st.subheader("완료 용어 수 분포")
+            st.bar_chart(snapshot.histogram.set_index("from")["users"])
+
+            st.subheader("상품 단계별 도달 인원")
+            st.bar_chart(snapshot.reward_tiers)
+
+            st.subheader("어려워하는 용어")
+            hardest = snapshot.terms.copy()
+            hardest["term"] = [catalog.get(term_id)["term"] if term_id in catalog else "" for term_id in hardest["term_id"]]
+            hardest["definition"] = [
+                catalog.get(term_id)["definition"] if term_id in catalog else "" for term_id in hardest["term_id"]
+            ]
+            st.dataframe(
+                hardest[["term", "definition", "users", "lapse_rate", "mean_ease"]],
+                hide_index=True,
+                use_container_width=True,
+            )
+    profiler.lap("코호트 대시보드")
 
 # 하단 정보
 st.markdown("---")
 st.markdown("Made with ❤️ for Medical Students")
 
 # 모든 용어 학습 완료 시 초기화 버튼
-if len(st.session_state.all_time_completed) == len(medical_terms):
+if catalog.remaining_count(user_progress.all_time_completed) == 0:
     st.success("🎓 축하합니다! 모든 의학 용어를 학습하셨습니다!")
     if st.button("처음부터 다시 시작하기"):
-        st.session_state.all_time_completed = []
-        st.session_state.completed_terms = []
-        st.session_state.monthly_completions = 0
-        st.session_state.daily_terms = {}
-        st.experimental_rerun()
+        progress_store.reset(USER_ID)
+        st.rerun()
+
+# 성능 디버그 패널 (측정을 켠 경우에만)
+if profiler.enabled:
+    profiler.lap("footer")
+    profiler.gauge("session_state_keys", len(st.session_state))
+    profiler.gauge(
+        "session_state_bytes", sum(sys.getsizeof(value) for value in st.session_state.to_dict().values())
+    )
+    profiler.gauge("user_completed_terms", len(user_progress.all_time_completed))
+    profiler.gauge("user_review_cards", len(user_progress.cards))
+    profiler.gauge("user_daily_entries", len(user_progress.daily_terms))
+    profiler.gauge("cached_users", progress_store.cached_users())
+    profiler.gauge("pending_progress_ops", progress_store.pending_count())
+    profiler.gauge("cached_term_cards", len(get_card_templates(TERMS_PATH, terms_mtime, full_catalog)))
+    laps = profiler.finish()
+    with st.sidebar.expander("🔧 성능 디버그"):
+        st.dataframe(
+            pd.DataFrame(
+                [(name, seconds * 1000) for name, seconds in laps],
+                columns=["구간", "ms"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.json(profiler.gauges)
+        st.caption(f"누적 통계: {PROFILE_DIR}")
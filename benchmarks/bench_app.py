@@ -0,0 +1,176 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import TermCatalog, iter_nested_rows  # noqa: E402
+from progress_store import ProgressStore, SQLiteBackend  # noqa: E402
+from rewards import REWARDS, next_reward  # noqa: E402
+from scheduler import pick_daily_terms  # noqa: E402
+from srs import QUALITY_GOOD, QUALITY_HARD  # noqa: E402
+from stats import month_key  # noqa: E402
+
+# 앱 로직 벤치마크
+# 합성 카테고리 트리(1천~1백만 용어)를 만들고 평탄화·오늘의 용어 선택·완료 처리·상품 계산을
+# 화면 없이 실행해 연산별 지연 시간과 메모리를 측정한다.
+# 기존 리스트 기반 세션 상태(용어 딕셔너리 목록 + `in` 비교)도 함께 재서 비교한다.
+#
+#   python benchmarks/bench_app.py --sizes 1000,10000,100000 --sessions 2000
+DAILY_COUNT = 6
+SYLLABLES = ["car", "dio", "neph", "gastr", "hepat", "pneum", "derm", "neur", "my", "oste", "angi", "cyst"]
+SUFFIXES = ["itis", "osis", "oma", "algia", "ectomy", "pathy", "plasty", "scopy"]
+HANGUL = "가나다라마바사아자차카타파하심근경색혈압폐렴간신장뇌염증"
+
+
+# 합성 카테고리 트리: depth단계, 단계마다 fanout개 하위 카테고리, 말단에 용어를 고르게 분배
+def make_nested(n_terms, depth=3, fanout=6, seed=0):
+    rng = random.Random(seed)
+    leaves = []
+
+    def build(level):
+        if level == depth:
+            terms = []
+            leaves.append(terms)
+            return terms
+        return {f"카테고리{level}-{i}": build(level + 1) for i in range(fanout)}
+
+    nested = build(0)
+    for i in range(n_terms):
+        term = rng.choice(SYLLABLES) + rng.choice(SYLLABLES) + rng.choice(SUFFIXES) + f" {i}"
+        definition = "".join(rng.choice(HANGUL) for _ in range(rng.randint(2, 6)))
+        leaves[i % len(leaves)].append({"term": term, "definition": definition})
+    return nested
+
+
+# 기존 app.py 방식 (비교용)
+def legacy_flatten(nested_dict):
+    flat_list = []
+    for val in nested_dict.values():
+        if isinstance(val, dict):
+            flat_list.extend(legacy_flatten(val))
+        elif isinstance(val, list):
+            flat_list.extend(val)
+    return flat_list
+
+
+def legacy_pick(medical_terms, all_time_completed, rng):
+    remaining_terms = [term for term in medical_terms if term not in all_time_completed]
+    sample_pool = medical_terms if len(remaining_terms) < DAILY_COUNT else remaining_terms
+    return rng.sample(sample_pool, DAILY_COUNT)
+
+
+def legacy_complete(term, state):
+    if term not in state["completed_terms"]:
+        state["completed_terms"].append(term)
+    if term not in state["all_time_completed"]:
+        state["all_time_completed"].append(term)
+        state["monthly_completions"] += 1
+
+
+class Timings:
+    def __init__(self):
+        self.samples = {}
+
+    def measure(self, name, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.samples.setdefault(name, []).append(time.perf_counter() - started)
+        return result
+
+    def rows(self):
+        for name, values in self.samples.items():
+            values = sorted(values)
+            yield (
+                name,
+                len(values),
+                statistics.fmean(values) * 1000,
+                values[len(values) // 2] * 1000,
+                values[min(len(values) - 1, int(len(values) * 0.95))] * 1000,
+            )
+
+
+def measure_memory(func, *args):
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def bench_size(n_terms, sessions, users, legacy_max, seed):
+    timings = Timings()
+    nested = make_nested(n_terms, seed=seed)
+    memory = {}
+
+    catalog, memory["catalog_build"] = measure_memory(TermCatalog.from_nested, nested)
+    timings.measure("flatten", TermCatalog, iter_nested_rows(nested))
+
+    rng = random.Random(seed)
+    user_ids = [f"user{i}" for i in range(users)]
+    # 저장소는 미래 날짜의 복습을 받지 않으므로 마지막 세션이 오늘이 되도록 시작일을 잡는다
+    start_day = date.today() - timedelta(days=(sessions - 1) // users)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProgressStore(SQLiteBackend(os.path.join(directory, "progress.db")), flush_interval=0.5)
+        tracemalloc.start()
+        for session in range(sessions):
+            user_id = user_ids[session % users]
+            day = start_day + timedelta(days=session // users)
+            progress = timings.measure("load_progress", store.get, user_id)
+            picked = timings.measure("daily_pick", pick_daily_terms, catalog, progress, user_id, day)
+            store.set_daily(user_id, day.isoformat(), picked)
+            for term_id in picked:
+                quality = QUALITY_GOOD if rng.random() < 0.8 else QUALITY_HARD
+                category = catalog.get(term_id)["category"]
+                timings.measure("complete", store.review, user_id, term_id, quality, day, category=category)
+            # 완료 처리(ProgressStore.complete)와 상품 화면이 쓰는 월별 장부 조회
+            month = month_key(day)
+            timings.measure("rewards", lambda: (progress.ledger.due_awards(month, REWARDS),
+                                                progress.ledger.awarded(month),
+                                                next_reward(progress.ledger.count(month))))
+            timings.measure("category_progress", catalog.category_progress, progress.all_time_completed)
+        _, memory["progress_state"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.measure("flush", store.flush)
+        store.close()
+
+    # 기존 리스트 방식은 O(용어 수 × 완료 수)라 큰 덱에서는 건너뜀
+    if n_terms <= legacy_max:
+        medical_terms = timings.measure("legacy_flatten", legacy_flatten, nested)
+        state = {"completed_terms": [], "all_time_completed": [], "monthly_completions": 0}
+        for _ in range(max(1, sessions // users)):
+            picked = timings.measure("legacy_daily_pick", legacy_pick, medical_terms, state["all_time_completed"], rng)
+            for term in picked:
+                timings.measure("legacy_complete", legacy_complete, term, state)
+    return timings, memory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="의학 용어 학습 앱 로직 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="용어 수 목록 (쉼표 구분)")
+    parser.add_argument("--sessions", type=int, default=2000, help="재생할 학습 세션 수")
+    parser.add_argument("--users", type=int, default=100, help="가상 사용자 수")
+    parser.add_argument("--legacy-max", type=int, default=20000, help="기존 방식을 측정할 최대 용어 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for n_terms in (int(size) for size in args.sizes.split(",")):
+        timings, memory = bench_size(n_terms, args.sessions, args.users, args.legacy_max, args.seed)
+        print(f"\n== {n_terms:,} terms, {args.sessions:,} sessions, {args.users:,} users ==")
+        print(f"{'operation':<20}{'calls':>8}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}")
+        for name, calls, mean, p50, p95 in timings.rows():
+            print(f"{name:<20}{calls:>8}{mean:>12.3f}{p50:>12.3f}{p95:>12.3f}")
+        for name, size in memory.items():
+            print(f"memory {name}: {size / 1024 / 1024:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# 카테고리 경로 구분자 (예: "임상 의학/신경계/두뇌")
+CATEGORY_SEP = "/"
+
+
+# 중첩된 딕셔너리를 (카테고리 경로, 용어) 행으로 평탄화
+def iter_nested_rows(nested_dict, path=()):
+    for key, val in nested_dict.items():
+        if isinstance(val, dict):
+            yield from iter_nested_rows(val, path + (key,))
+        elif isinstance(val, list):
+            for term in val:
+                yield {
+                    "category": CATEGORY_SEP.join(path + (key,)),
+                    "term": term["term"],
+                    "definition": term["definition"],
+                }
+
+
+# 용어 id 비트맵: 사용자별 완료 집합을 id당 1비트로 보관 (id는 0 이상의 정수)
+class TermIdSet:
+    __slots__ = ("_bits", "_count")
+
+    def __init__(self, term_ids=()):
+        self._bits = bytearray()
+        self._count = 0
+        for term_id in term_ids:
+            self.add(term_id)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, term_id):
+        byte = term_id >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] >> (term_id & 7) & 1)
+
+    def __iter__(self):
+        for byte, value in enumerate(self._bits):
+            if value:
+                for bit in range(8):
+                    if value >> bit & 1:
+                        yield (byte << 3) | bit
+
+    def add(self, term_id):
+        byte = term_id >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        mask = 1 << (term_id & 7)
+        if not self._bits[byte] & mask:
+            self._bits[byte] |= mask
+            self._count += 1
+
+    def discard(self, term_id):
+        if term_id in self:
+            self._bits[term_id >> 3] &= ~(1 << (term_id & 7)) & 0xFF
+            self._count -= 1
+
+    def clear(self):
+        self._bits = bytearray()
+        self._count = 0
+
+
+# 용어 카탈로그: 각 용어에 고정 id를 부여하고 id 기반 조회를 제공
+# 학습 상태는 용어 딕셔너리 대신 id 집합으로 관리해 비교 비용을 O(1)로 유지
+class TermCatalog:
+    def __init__(self, rows, scoped=False):
+        self.terms = []
+        self._index = {}
+        # 카테고리 경로 인덱스: 경로의 각 단계(노드)에 id를 붙이고
+        # 용어 위치 -> 말단 노드, 노드 -> 부모 노드, 노드별 용어 수를 미리 계산
+        # (부모 노드가 항상 자식보다 먼저 만들어진다)
+        self.node_paths = []
+        self.node_parents = []
+        self.node_totals = []
+        self._node_ids = {}
+        self._term_nodes = []
+        for row in rows:
+            term_id = row.get("id", len(self.terms))
+            self._index[term_id] = len(self.terms)
+            self.terms.append({
+                "id": term_id,
+                "category": row["category"],
+                "term": row["term"],
+                "definition": row["definition"],
+            })
+            node_id = self._add_path(tuple(row["category"].split(CATEGORY_SEP)))
+            self._term_nodes.append(node_id)
+            while node_id >= 0:
+                self.node_totals[node_id] += 1
+                node_id = self.node_parents[node_id]
+        self.ids = [term["id"] for term in self.terms]
+        # 일부 카테고리만 불러온 경우 완료 집합에 범위 밖 id가 섞일 수 있음
+        self.scoped = scoped
+
+    @classmethod
+    def from_nested(cls, nested_dict):
+        return cls(iter_nested_rows(nested_dict))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term_id):
+        return term_id in self._index
+
+    def get(self, term_id):
+        return self.terms[self._index[term_id]]
+
+    def _add_path(self, path):
+        node_id = self._node_ids.get(path)
+        if node_id is None:
+            parent_id = self._add_path(path[:-1]) if len(path) > 1 else -1
+            node_id = len(self.node_paths)
+            self._node_ids[path] = node_id
+            self.node_paths.append(path)
+            self.node_parents.append(parent_id)
+            self.node_totals.append(0)
+        return node_id
+
+    # 용어가 속한 말단 카테고리 노드 id
+    def term_node(self, term_id):
+        return self._term_nodes[self._index[term_id]]
+
+    # 용어의 카테고리 경로 (예: ("임상 의학", "신경계", "두뇌"))
+    def term_path(self, term_id):
+        return self.node_paths[self.term_node(term_id)]
+
+    # 카테고리 노드별 완료 수: 말단 노드에 완료 용어를 세고 부모 방향으로 한 번 합산
+    # 반환값은 노드 순서대로 (경로, 완료 수, 전체 용어 수)
+    def category_progress(self, completed_ids):
+        done = [0] * len(self.node_paths)
+        for term_id in completed_ids:
+            position = self._index.get(term_id)
+            if position is not None:
+                done[self._term_nodes[position]] += 1
+        for node_id in range(len(self.node_paths) - 1, -1, -1):
+            parent_id = self.node_parents[node_id]
+            if parent_id >= 0:
+                done[parent_id] += done[node_id]
+        return list(zip(self.node_paths, done, self.node_totals))
+
+    def completed_count(self, completed_ids):
+        if not self.scoped:
+            return len(completed_ids)
+        return sum(1 for term_id in completed_ids if term_id in self._index)
+
+    def remaining_count(self, completed_ids):
+        return len(self) - self.completed_count(completed_ids)
+
+    def progress(self, completed_ids):
+        if not self.terms:
+            return 0.0
+        return self.completed_count(completed_ids) / len(self.terms)
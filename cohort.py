@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from rewards import REWARDS
+from stats import month_key
+
+# 코호트(반 전체) 대시보드 집계
+# 백그라운드 스레드가 주기적으로 저장소의 사용자별 진행 상황을 읽어 pandas 표로 압축한
+# 스냅샷을 만들고, 대시보드 화면은 가장 최근 스냅샷만 읽는다 (rerun 중에는 집계하지 않음).
+DEFAULT_REFRESH_INTERVAL = 60.0
+HISTOGRAM_BINS = 10
+HARDEST_TERMS = 20
+
+
+class CohortSnapshot:
+    def __init__(self, users, terms, histogram, reward_tiers, built_at, elapsed):
+        # 사용자별: user_id, completed, monthly_completions(이번 달), cards, reward_tier
+        self.users = users
+        # 용어별: term_id, users, mean_ease, lapses, lapse_rate (어려운 순)
+        self.terms = terms
+        # 완료 용어 수 분포: (구간 시작값, 사용자 수) 표
+        self.histogram = histogram
+        # 상품 단계별 도달한 사용자 수
+        self.reward_tiers = reward_tiers
+        self.built_at = built_at
+        self.elapsed = elapsed
+
+
+def build_snapshot(backend, rewards=REWARDS, month=None):
+    started = time.perf_counter()
+    users = pd.DataFrame(
+        list(backend.iter_user_totals(month or month_key(datetime.now()))),
+        columns=["user_id", "completed", "monthly_completions", "cards"],
+    )
+    thresholds = np.array(sorted(rewards), dtype=np.int64)
+    monthly = users["monthly_completions"].to_numpy(dtype=np.int64)
+    # 도달한 가장 높은 상품 단계 (0이면 아직 없음)
+    tier_index = np.searchsorted(thresholds, monthly, side="right")
+    users["reward_tier"] = np.concatenate(([0], thresholds))[tier_index]
+    reward_tiers = pd.Series(
+        [(monthly >= threshold).sum() for threshold in thresholds],
+        index=[f"{threshold}회 - {rewards[threshold]}" for threshold in thresholds],
+        dtype=np.int64,
+    )
+
+    completed = users["completed"].to_numpy(dtype=np.int64)
+    if len(completed):
+        counts, edges = np.histogram(completed, bins=HISTOGRAM_BINS)
+        histogram = pd.DataFrame({"from": edges[:-1].round().astype(np.int64), "users": counts})
+    else:
+        histogram = pd.DataFrame({"from": pd.Series(dtype=np.int64), "users": pd.Series(dtype=np.int64)})
+
+    terms = pd.DataFrame(
+        list(backend.iter_term_difficulty()),
+        columns=["term_id", "users", "ease_sum", "lapses"],
+    )
+    terms["mean_ease"] = terms["ease_sum"] / terms["users"].where(terms["users"] > 0, 1)
+    terms["lapse_rate"] = terms["lapses"] / terms["users"].where(terms["users"] > 0, 1)
+    terms = terms.drop(columns="ease_sum").sort_values(
+        ["lapse_rate", "mean_ease", "users", "term_id"], ascending=[False, True, False, True]
+    ).head(HARDEST_TERMS).reset_index(drop=True)
+
+    return CohortSnapshot(
+        users, terms, histogram, reward_tiers, datetime.now(), time.perf_counter() - started,
+    )
+
+
+class CohortAggregator:
+    def __init__(self, backend, interval=DEFAULT_REFRESH_INTERVAL):
+        self.backend = backend
+        self.interval = interval
+        self.latest = None
+        self.last_error = None
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cohort-aggregator", daemon=True)
+        self._thread.start()
+
+    # 다음 주기를 기다리지 않고 바로 다시 집계
+    def refresh(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                # 참조 교체는 원자적이므로 화면은 잠금 없이 latest를 읽는다
+                self.latest = build_snapshot(self.backend)
+                self.last_error = None
+            except Exception as error:
+                self.last_error = error
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
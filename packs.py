@@ -0,0 +1,229 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import term_store
+from scheduler import DAILY_COUNT, DailyScheduler
+from srs import QUALITY_GOOD
+from stats import week_key
+from transfer import MAX_REPORTED_ERRORS, iter_records
+
+# 오프라인 학습팩
+# 카탈로그를 카테고리별로, 사용자의 오늘의 학습 스케줄을 주별로 나눠 gzip JSON 묶음으로 만든다.
+# 파일 이름에 내용 해시가 들어가므로 내용이 같으면 이름도 같고, 클라이언트는 한 번 받은 묶음을
+# 계속 캐시해 두고 manifest.json만 새로 받으면 된다. 오프라인에서 누른 완료 / 어려워요 기록은
+# 나중에 한 번에 apply_sync로 서버 저장소에 반영한다.
+PACK_FORMAT = 1
+DEFAULT_WEEKS = 4
+MANIFEST_NAME = "manifest.json"
+TERM_FIELDS = ("id", "term", "definition")
+SYNC_FIELDS = ("term_id", "quality", "reviewed_at")
+
+
+# 압축한 묶음과 해시가 들어간 파일 이름 (같은 내용이면 항상 같은 바이트)
+def encode_bundle(kind, payload):
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    return f"{kind}.{digest}.json.gz", gzip.compress(raw, mtime=0)
+
+
+# 카테고리 경로별 용어 묶음 {카테고리: 내용}
+def category_payloads(catalog):
+    payloads = {}
+    for term_id in catalog.ids:
+        term = catalog.get(term_id)
+        payload = payloads.get(term["category"])
+        if payload is None:
+            payload = payloads[term["category"]] = {
+                "category": term["category"], "fields": list(TERM_FIELDS), "terms": [],
+            }
+        payload["terms"].append([term_id, term["term"], term["definition"]])
+    return payloads
+
+
+# start부터 weeks주 동안의 오늘의 학습 용어 {주: {날짜: [용어 id]}}
+# 이미 정해진 날짜는 그대로 쓰고, 나머지 날짜는 저장소에 고정하지 않고 미리 계산만 한다.
+# 오프라인에서는 배정된 날 복습한다고 보고, 앞 날짜에 넣은 복습 카드와 새 용어는 다시 넣지 않는다
+# (pick_daily_terms를 날짜마다 그대로 부르면 오늘 복습할 카드가 이후 모든 날짜에 반복됨).
+def week_schedules(catalog, store, user_id, start, weeks, k=DAILY_COUNT):
+    scheduler = DailyScheduler(catalog, user_id, k)
+    schedules = {}
+    placed = set()
+    with store.locked(user_id) as progress:
+        for offset in range(weeks * 7):
+            day = start + timedelta(days=offset)
+            date_key = day.strftime("%Y-%m-%d")
+            term_ids = progress.daily_terms.get(date_key)
+            if not term_ids or any(term_id not in catalog for term_id in term_ids):
+                term_ids = progress.due_index.due_terms(
+                    day, k, include=lambda term_id: term_id in catalog and term_id not in placed
+                )
+                picked = placed.union(term_ids)
+
+                def is_known(term_id):
+                    return term_id in picked or term_id in progress.cards or term_id in progress.all_time_completed
+
+                term_ids += scheduler.new_terms_for(day, k - len(term_ids), is_known)
+                # 새 용어가 모자라면(거의 다 학습한 경우) 날짜 구간의 용어로 채움
+                if len(term_ids) < k:
+                    term_ids += scheduler.new_terms_for(day, k - len(term_ids), set(term_ids).__contains__)
+            placed.update(term_ids)
+            schedules.setdefault(week_key(day), {})[date_key] = list(term_ids)
+    return schedules
+
+
+# 학습팩 파일 목록 [(파일 이름, 바이트)] (마지막이 manifest.json)
+def build_study_pack(catalog, store, user_id, start=None, weeks=DEFAULT_WEEKS):
+    start = start or date.today()
+    files = []
+    category_files = {}
+    for category, payload in category_payloads(catalog).items():
+        filename, data = encode_bundle("category", payload)
+        category_files[category] = filename
+        files.append((filename, data))
+
+    week_files = {}
+    for week, days in week_schedules(catalog, store, user_id, start, weeks).items():
+        # 주 묶음에는 용어 id만 두고, 내용은 필요한 카테고리 묶음에서 찾는다
+        categories = sorted({catalog.get(term_id)["category"] for term_ids in days.values() for term_id in term_ids})
+        filename, data = encode_bundle("week", {
+            "week": week,
+            "days": days,
+            "categories": [category_files[category] for category in categories],
+        })
+        week_files[week] = filename
+        files.append((filename, data))
+
+    manifest = {
+        "format": PACK_FORMAT,
+        "user_id": user_id,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "terms": len(catalog),
+        "categories": category_files,
+        "weeks": week_files,
+        "sync_fields": list(SYNC_FIELDS),
+    }
+    files.append((MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")))
+    return files
+
+
+# 해시 이름의 묶음은 이미 있으면 건너뛰고, manifest.json은 마지막에 교체
+def write_pack(files, directory):
+    os.makedirs(directory, exist_ok=True)
+    for filename, data in files:
+        path = os.path.join(directory, filename)
+        if filename != MANIFEST_NAME and os.path.exists(path):
+            continue
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+
+class SyncReport:
+    def __init__(self):
+        self.applied = 0
+        # 이미 반영했거나 그 뒤에 더 최근 복습이 있는 기록
+        self.stale = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def reject(self, index, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{index}번째 기록: {message}")
+
+
+# 검증을 통과하면 (복습 시각, 용어 id, 평가), 아니면 오류 메시지
+def validate_sync_record(record, catalog, now):
+    if not isinstance(record, dict):
+        return None, "기록을 읽을 수 없습니다"
+    term_id = record.get("term_id")
+    if not isinstance(term_id, int) or isinstance(term_id, bool) or term_id not in catalog:
+        return None, "알 수 없는 용어입니다"
+    quality = record.get("quality", QUALITY_GOOD)
+    if not isinstance(quality, int) or isinstance(quality, bool) or not 0 <= quality <= 5:
+        return None, "quality는 0~5 사이 정수여야 합니다"
+    try:
+        reviewed_at = datetime.fromisoformat(record.get("reviewed_at", ""))
+    except (TypeError, ValueError):
+        return None, "reviewed_at 시각 형식이 잘못되었습니다"
+    if reviewed_at.tzinfo is not None:
+        reviewed_at = reviewed_at.astimezone().replace(tzinfo=None)
+    if reviewed_at > now + timedelta(minutes=5) or reviewed_at.date() > date.today():
+        return None, "미래 시각의 기록입니다"
+    return (reviewed_at, term_id, quality), None
+
+
+# 오프라인 복습 기록을 시각 순서대로 저장소에 반영
+# 저장소는 카드마다 마지막 복습일을 기록하고 그날이나 그 이전의 복습은 무시하므로,
+# 응답을 못 받은 클라이언트가 같은 묶음을 다시 보내도 두 번 반영되지 않고,
+# 온라인에서 먼저 복습한 카드에 더 오래된 오프라인 기록이 덮어쓰이지 않는다 (stale로 집계).
+# 같은 묶음 안의 중복(같은 용어·같은 시각)은 검증 단계에서 한 번만 남긴다.
+def apply_sync(store, catalog, user_id, records, now=None):
+    now = now or datetime.now()
+    report = SyncReport()
+    reviews = set()
+    for index, record in enumerate(records, start=1):
+        review, error = validate_sync_record(record, catalog, now)
+        if error:
+            report.reject(index, error)
+        elif review in reviews:
+            report.duplicates += 1
+        else:
+            reviews.add(review)
+    for reviewed_at, term_id, quality in sorted(reviews):
+        card = store.review(
+            user_id, term_id, quality, reviewed_at.date(), now=reviewed_at,
+            category=catalog.get(term_id)["category"],
+        )
+        if card is None:
+            report.stale += 1
+        else:
+            report.applied += 1
+    return report
+
+
+# python packs.py build --user alice --weeks 4 --out packs/alice
+# python packs.py sync --user alice alice_outbox.jsonl
+def main(argv=None):
+    from progress_store import DEFAULT_PROGRESS_PATH, ProgressStore, open_backend
+
+    parser = argparse.ArgumentParser(description="오프라인 학습팩 만들기 / 오프라인 기록 동기화")
+    parser.add_argument("--terms", default=term_store.default_terms_path())
+    parser.add_argument("--progress", default=DEFAULT_PROGRESS_PATH)
+    parser.add_argument("--user", required=True)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build")
+    build_parser.add_argument("--start", type=date.fromisoformat, default=date.today())
+    build_parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS)
+    build_parser.add_argument("--out", required=True)
+    sync_parser = subparsers.add_parser("sync")
+    sync_parser.add_argument("source", help="JSON Lines (term_id, quality, reviewed_at)")
+    args = parser.parse_args(argv)
+
+    catalog = term_store.load_catalog(args.terms)
+    store = ProgressStore(open_backend(args.progress))
+    try:
+        if args.command == "build":
+            files = build_study_pack(catalog, store, args.user, args.start, args.weeks)
+            write_pack(files, args.out)
+            print(f"{len(files)}개 파일, {sum(len(data) for _, data in files):,} 바이트")
+        else:
+            with open(args.source, encoding="utf-8") as f:
+                report = apply_sync(store, catalog, args.user, iter_records(f, "jsonl"))
+            print(
+                f"반영 {report.applied}개, 이미 반영됨 {report.stale}개, "
+                f"중복 {report.duplicates}개, 오류 {report.invalid}개"
+            )
+            for error in report.errors:
+                print(error)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+
+# 스크립트 재실행(rerun) 구간별 소요 시간 측정
+# 각 rerun은 RerunProfiler로 구간(lap)별 시간을 재고, 끝나면 프로세스 전역
+# ProfileRegistry에 합산한다. 누적 값은 JSON과 Prometheus 텍스트 형식으로 내보낸다.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRIC_PREFIX = "medterm"
+
+
+class SectionStats:
+    __slots__ = ("count", "total", "max", "last", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ProfileRegistry:
+    def __init__(self, export_dir=None, export_interval=10.0):
+        self.export_dir = export_dir
+        self.export_interval = export_interval
+        self.sections = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def record(self, laps, gauges):
+        with self._lock:
+            for name, seconds in laps:
+                self.sections.setdefault(name, SectionStats()).observe(seconds)
+            self.gauges.update(gauges)
+            # 내보내기는 export_interval마다 한 번만 (동시에 끝난 rerun끼리 겹치지 않게)
+            export_due = bool(self.export_dir) and time.monotonic() - self._last_export >= self.export_interval
+            if export_due:
+                self._last_export = time.monotonic()
+        if export_due:
+            self.export(self.export_dir)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "sections": {name: stats.to_dict() for name, stats in self.sections.items()},
+                "gauges": dict(self.gauges),
+            }
+
+    def to_prometheus(self):
+        metric = f"{METRIC_PREFIX}_rerun_section_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in each section of an app rerun.",
+            f"# TYPE {metric} histogram",
+        ]
+        with self._lock:
+            for name, stats in sorted(self.sections.items()):
+                label = _label(name)
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'{metric}_bucket{{section="{label}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{section="{label}",le="+Inf"}} {stats.count}')
+                lines.append(f'{metric}_sum{{section="{label}"}} {stats.total}')
+                lines.append(f'{metric}_count{{section="{label}"}} {stats.count}')
+            gauge = f"{METRIC_PREFIX}_state_size"
+            lines.append(f"# HELP {gauge} Size of session and progress state.")
+            lines.append(f"# TYPE {gauge} gauge")
+            for name, value in sorted(self.gauges.items()):
+                lines.append(f'{gauge}{{name="{_label(name)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._last_export = time.monotonic()
+        files = {
+            "profile.json": json.dumps(self.snapshot(), ensure_ascii=False, indent=2),
+            "profile.prom": self.to_prometheus(),
+        }
+        for filename, text in files.items():
+            path = os.path.join(directory, filename)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(path + ".tmp", path)
+
+
+class RerunProfiler:
+    enabled = True
+
+    def __init__(self, registry=None):
+        self.registry = registry
+        self.laps = []
+        self.gauges = {}
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    # 직전 lap 이후 걸린 시간을 name 구간으로 기록
+    def lap(self, name):
+        now = time.perf_counter()
+        self.laps.append((name, now - self._last))
+        self._last = now
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def finish(self):
+        self.laps.append(("total", time.perf_counter() - self._started))
+        if self.registry is not None:
+            self.registry.record(self.laps, self.gauges)
+        return self.laps
+
+
+# 측정을 끈 경우에 쓰는 빈 프로파일러 (호출 비용만 남음)
+class NullProfiler:
+    enabled = False
+    laps = ()
+    gauges = {}
+
+    def lap(self, name):
+        pass
+
+    def gauge(self, name, value):
+        pass
+
+    def finish(self):
+        return ()
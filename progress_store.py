@@ -0,0 +1,631 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from urllib.parse import quote, unquote
+
+import srs
+from catalog import TermIdSet
+from rewards import REWARDS, MonthlyLedger
+from scheduler import pick_daily_terms
+from srs import Card, DueIndex, QUALITY_GOOD
+from stats import StatsRollup, month_key
+
+# 학습 진행 상황 저장소
+# 완료 클릭은 메모리 캐시에 즉시 반영하고, 변경 내역은 버퍼에 모았다가
+# 백그라운드 스레드가 일정 간격으로 한 번에 기록한다 (write-behind)
+DEFAULT_PROGRESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "progress.db")
+
+
+# 사용자 한 명의 학습 상태 (용어는 id로만 보관, 완료 집합은 비트맵)
+# 완료 시각은 저장소에만 두고 메모리에는 올리지 않는다
+class UserProgress:
+    __slots__ = (
+        "all_time_completed", "ledger", "daily_terms", "cards", "due_index", "stats", "lock", "stored_version",
+    )
+
+    def __init__(self):
+        # 이 사용자의 상태를 읽고 바꿀 때 잡는 잠금 (ProgressStore.locked로 사용)
+        self.lock = threading.RLock()
+        # 읽어 온 시점의 저장소 버전 (다른 프로세스가 기록하면 달라짐)
+        self.stored_version = 0
+        self.all_time_completed = TermIdSet()
+        # 월별 완료 수와 상품 획득 기록 (초기화해도 유지되어 같은 달 상품은 한 번만 지급)
+        self.ledger = MonthlyLedger()
+        # {날짜(str): [용어 id 6개]}
+        self.daily_terms = {}
+        # 간격 반복 카드 {용어 id: Card}와 다음 복습일 인덱스
+        self.cards = {}
+        self.due_index = DueIndex(self.cards)
+        # 완료 이벤트 집계 (초기화해도 이력은 유지)
+        self.stats = StatsRollup()
+
+
+def completion_month(completed_at):
+    return month_key(datetime.fromisoformat(completed_at))
+
+
+# 변경 내역(op) 형식
+# ("complete", user_id, term_id, completed_at)
+# ("award", user_id, month, count, awarded_at)
+# ("daily", user_id, date_key, term_ids)
+# ("review", user_id, term_id, interval, ease, due, reps, last_review)
+# ("event", user_id, term_id, occurred_at, category)
+# ("reset", user_id)
+def apply_op(progress, op):
+    kind = op[0]
+    if kind == "complete":
+        term_id = op[2]
+        if term_id not in progress.all_time_completed:
+            progress.all_time_completed.add(term_id)
+            progress.ledger.add(completion_month(op[3]))
+    elif kind == "award":
+        _, _, month, count, awarded_at = op
+        progress.ledger.award(month, count, awarded_at)
+    elif kind == "daily":
+        _, _, date_key, term_ids = op
+        progress.daily_terms[date_key] = list(term_ids)
+    elif kind == "review":
+        progress.due_index.push(Card(*op[2:]))
+    elif kind == "event":
+        _, _, term_id, occurred_at, category = op
+        progress.stats.add(occurred_at, term_id, category)
+    elif kind == "reset":
+        progress.all_time_completed.clear()
+        progress.daily_terms.clear()
+        progress.due_index.clear()
+
+
+class SQLiteBackend:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions (user_id TEXT NOT NULL, term_id INTEGER NOT NULL, "
+                "completed_at TEXT NOT NULL, PRIMARY KEY (user_id, term_id))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_terms (user_id TEXT NOT NULL, date_key TEXT NOT NULL, "
+                "term_ids TEXT NOT NULL, PRIMARY KEY (user_id, date_key))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS monthly_ledger (user_id TEXT NOT NULL, month TEXT NOT NULL, "
+                "completions INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, month))"
+            )
+            # (사용자, 월, 단계)가 기본 키라 같은 상품이 두 번 기록되지 않는다
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reward_awards (user_id TEXT NOT NULL, month TEXT NOT NULL, "
+                "count INTEGER NOT NULL, awarded_at TEXT NOT NULL, PRIMARY KEY (user_id, month, count))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cards (user_id TEXT NOT NULL, term_id INTEGER NOT NULL, "
+                "interval INTEGER NOT NULL, ease REAL NOT NULL, due INTEGER NOT NULL, reps INTEGER NOT NULL, "
+                "last_review INTEGER NOT NULL, PRIMARY KEY (user_id, term_id))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events (user_id TEXT NOT NULL, occurred_at TEXT NOT NULL, "
+                "term_id INTEGER NOT NULL, category TEXT NOT NULL DEFAULT '')"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_user ON events (user_id, occurred_at)")
+            # 사용자별 기록 버전: 일괄 기록마다 1씩 올려 다른 프로세스의 기록을 알아챈다
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_versions (user_id TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+
+    def load(self, user_id):
+        progress = UserProgress()
+        with self._lock:
+            # 버전을 먼저 읽는다 (읽는 사이 다른 기록이 끼어들면 다음 확인 때 다시 읽게 됨)
+            row = self._conn.execute("SELECT version FROM user_versions WHERE user_id = ?", (user_id,)).fetchone()
+            progress.stored_version = row[0] if row else 0
+            for (term_id,) in self._conn.execute(
+                "SELECT term_id FROM completions WHERE user_id = ?", (user_id,)
+            ):
+                progress.all_time_completed.add(term_id)
+            for date_key, term_ids in self._conn.execute(
+                "SELECT date_key, term_ids FROM daily_terms WHERE user_id = ?", (user_id,)
+            ):
+                progress.daily_terms[date_key] = json.loads(term_ids)
+            for row in self._conn.execute(
+                "SELECT term_id, interval, ease, due, reps, last_review FROM cards WHERE user_id = ?", (user_id,)
+            ):
+                progress.cards[row[0]] = Card(*row)
+            for occurred_at, term_id, category in self._conn.execute(
+                "SELECT occurred_at, term_id, category FROM events WHERE user_id = ? ORDER BY occurred_at",
+                (user_id,),
+            ):
+                progress.stats.add(occurred_at, term_id, category)
+            for month, completions in self._conn.execute(
+                "SELECT month, completions FROM monthly_ledger WHERE user_id = ?", (user_id,)
+            ):
+                progress.ledger.add(month, completions)
+            for month, count, awarded_at in self._conn.execute(
+                "SELECT month, count, awarded_at FROM reward_awards WHERE user_id = ?", (user_id,)
+            ):
+                progress.ledger.award(month, count, awarded_at)
+        progress.due_index = DueIndex(progress.cards)
+        return progress
+
+    # 기록한 사용자별 (기록 전 버전, 기록 후 버전)
+    def write_batch(self, ops):
+        versions = {}
+        with self._lock, self._conn:
+            for user_id in dict.fromkeys(op[1] for op in ops):
+                self._conn.execute(
+                    "INSERT INTO user_versions (user_id, version) VALUES (?, 1) "
+                    "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+                    (user_id,),
+                )
+                (version,) = self._conn.execute(
+                    "SELECT version FROM user_versions WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                versions[user_id] = (version - 1, version)
+            for op in ops:
+                kind, user_id = op[0], op[1]
+                if kind == "complete":
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO completions (user_id, term_id, completed_at) VALUES (?, ?, ?)",
+                        (user_id, op[2], op[3]),
+                    )
+                    if cursor.rowcount:
+                        self._conn.execute(
+                            "INSERT INTO monthly_ledger (user_id, month, completions) VALUES (?, ?, 1) "
+                            "ON CONFLICT(user_id, month) DO UPDATE SET completions = completions + 1",
+                            (user_id, completion_month(op[3])),
+                        )
+                elif kind == "award":
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO reward_awards (user_id, month, count, awarded_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (user_id, *op[2:]),
+                    )
+                elif kind == "daily":
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO daily_terms (user_id, date_key, term_ids) VALUES (?, ?, ?)",
+                        (user_id, op[2], json.dumps(list(op[3]))),
+                    )
+                elif kind == "review":
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cards (user_id, term_id, interval, ease, due, reps, last_review) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (user_id, *op[2:]),
+                    )
+                elif kind == "event":
+                    self._conn.execute(
+                        "INSERT INTO events (user_id, term_id, occurred_at, category) VALUES (?, ?, ?, ?)",
+                        (user_id, *op[2:]),
+                    )
+                elif kind == "reset":
+                    for table in ("completions", "daily_terms", "cards"):
+                        self._conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+        return versions
+
+    # 사용자별 현재 버전 (기록이 없으면 0)
+    def versions(self, user_ids):
+        found = {}
+        with self._lock:
+            for start in range(0, len(user_ids), 500):
+                chunk = user_ids[start:start + 500]
+                found.update(self._conn.execute(
+                    f"SELECT user_id, version FROM user_versions WHERE user_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ))
+        return {user_id: found.get(user_id, 0) for user_id in user_ids}
+
+    # 내보내기용: 읽기 전용 연결에서 행을 하나씩 돌려준다 (WAL이라 기록과 동시에 읽기 가능)
+    def _iter_query(self, query, params):
+        conn = sqlite3.connect(self.path)
+        try:
+            yield from conn.execute(query, params)
+        finally:
+            conn.close()
+
+    # (용어 id, 완료 시각)
+    def iter_completions(self, user_id):
+        return self._iter_query(
+            "SELECT term_id, completed_at FROM completions WHERE user_id = ? ORDER BY completed_at", (user_id,)
+        )
+
+    # (날짜, [용어 id])
+    def iter_daily(self, user_id):
+        for date_key, term_ids in self._iter_query(
+            "SELECT date_key, term_ids FROM daily_terms WHERE user_id = ? ORDER BY date_key", (user_id,)
+        ):
+            yield date_key, json.loads(term_ids)
+
+    # 코호트 집계용: 사용자별 (아이디, 완료 용어 수, month의 완료 수, 복습 카드 수)
+    # 초기화한 사용자도 장부는 남으므로 JSON 저장소처럼 기록이 있는 모든 사용자를 포함한다
+    def iter_user_totals(self, month):
+        return self._iter_query(
+            "SELECT u.user_id, "
+            "(SELECT COUNT(*) FROM completions c WHERE c.user_id = u.user_id), "
+            "COALESCE((SELECT completions FROM monthly_ledger m WHERE m.user_id = u.user_id AND m.month = ?), 0), "
+            "(SELECT COUNT(*) FROM cards k WHERE k.user_id = u.user_id) "
+            "FROM (SELECT user_id FROM completions UNION SELECT user_id FROM cards "
+            "UNION SELECT user_id FROM monthly_ledger UNION SELECT user_id FROM daily_terms) u",
+            (month,),
+        )
+
+    # 코호트 집계용: 용어별 (용어 id, 카드 보유 사용자 수, ease 합계, 다시 배우는 중인 카드 수)
+    def iter_term_difficulty(self):
+        return self._iter_query(
+            "SELECT term_id, COUNT(*), SUM(ease), SUM(reps = 0) FROM cards GROUP BY term_id", ()
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# SQLite를 쓸 수 없는 환경을 위한 대체 저장소: 사용자별 JSON 파일
+class JsonFileBackend:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, user_id):
+        return os.path.join(self.directory, quote(user_id, safe="") + ".json")
+
+    # 파일 수정 시각을 버전으로 쓴다 (파일이 없으면 0)
+    def _version(self, user_id):
+        try:
+            return os.stat(self._path(user_id)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _read_data(self, user_id):
+        try:
+            with open(self._path(user_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _to_progress(data):
+        progress = UserProgress()
+        progress.all_time_completed = TermIdSet(int(term_id) for term_id in data.get("completed_at", {}))
+        progress.ledger.completions = dict(data.get("monthly", {}))
+        for month, awards in data.get("awards", {}).items():
+            for count, awarded_at in awards.items():
+                progress.ledger.award(month, int(count), awarded_at)
+        progress.daily_terms = data.get("daily_terms", {})
+        progress.cards = {int(term_id): Card(int(term_id), *values) for term_id, values in data.get("cards", {}).items()}
+        progress.due_index = DueIndex(progress.cards)
+        for term_id, occurred_at, category in data.get("events", []):
+            progress.stats.add(occurred_at, term_id, category)
+        return progress
+
+    def _write(self, user_id, progress, completed_at, events):
+        data = {
+            "completed_at": completed_at,
+            "monthly": progress.ledger.completions,
+            "awards": {
+                month: {str(count): awarded_at for count, awarded_at in awards.items()}
+                for month, awards in progress.ledger.awards.items()
+            },
+            "daily_terms": progress.daily_terms,
+            "cards": {
+                str(term_id): [card.interval, card.ease, card.due, card.reps, card.last_review]
+                for term_id, card in progress.cards.items()
+            },
+            "events": events,
+        }
+        path = self._path(user_id)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, user_id):
+        with self._lock:
+            version = self._version(user_id)
+            progress = self._to_progress(self._read_data(user_id))
+            progress.stored_version = version
+            return progress
+
+    def write_batch(self, ops):
+        # 사용자별로 묶어 파일을 한 번씩만 다시 쓴다
+        by_user = {}
+        for op in ops:
+            by_user.setdefault(op[1], []).append(op)
+        versions = {}
+        with self._lock:
+            for user_id, user_ops in by_user.items():
+                before = self._version(user_id)
+                data = self._read_data(user_id)
+                progress = self._to_progress(data)
+                completed_at = data.get("completed_at", {})
+                events = data.get("events", [])
+                for op in user_ops:
+                    apply_op(progress, op)
+                    if op[0] == "complete":
+                        completed_at.setdefault(str(op[2]), op[3])
+                    elif op[0] == "reset":
+                        completed_at.clear()
+                    elif op[0] == "event":
+                        events.append(list(op[2:]))
+                self._write(user_id, progress, completed_at, events)
+                versions[user_id] = (before, self._version(user_id))
+        return versions
+
+    def versions(self, user_ids):
+        with self._lock:
+            return {user_id: self._version(user_id) for user_id in user_ids}
+
+    def iter_completions(self, user_id):
+        with self._lock:
+            completed_at = self._read_data(user_id).get("completed_at", {})
+        return sorted(((int(term_id), ts) for term_id, ts in completed_at.items()), key=lambda row: row[1])
+
+    def iter_daily(self, user_id):
+        with self._lock:
+            daily_terms = self._read_data(user_id).get("daily_terms", {})
+        return sorted(daily_terms.items())
+
+    def _iter_all_data(self):
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(".json"):
+                user_id = unquote(filename[:-len(".json")])
+                with self._lock:
+                    data = self._read_data(user_id)
+                yield user_id, data
+
+    def iter_user_totals(self, month):
+        for user_id, data in self._iter_all_data():
+            yield (
+                user_id,
+                len(data.get("completed_at", {})),
+                data.get("monthly", {}).get(month, 0),
+                len(data.get("cards", {})),
+            )
+
+    def iter_term_difficulty(self):
+        totals = {}
+        for _, data in self._iter_all_data():
+            for term_id, (_, ease, _, reps, _) in data.get("cards", {}).items():
+                users, ease_sum, lapses = totals.get(int(term_id), (0, 0.0, 0))
+                totals[int(term_id)] = (users + 1, ease_sum + ease, lapses + (reps == 0))
+        for term_id, (users, ease_sum, lapses) in totals.items():
+            yield term_id, users, ease_sum, lapses
+
+    def close(self):
+        pass
+
+
+# SQLite 기본, 열 수 없으면 같은 위치의 JSON 디렉터리로 대체
+def open_backend(path=DEFAULT_PROGRESS_PATH):
+    if os.path.isdir(path):
+        return JsonFileBackend(path)
+    try:
+        return SQLiteBackend(path)
+    except sqlite3.Error:
+        return JsonFileBackend(os.path.splitext(path)[0] + "_json")
+
+
+# 여러 세션이 공유하는 프로세스 전역 저장소
+# 메모리 캐시는 최근 사용한 max_cached_users명까지만 유지하고,
+# 기록이 끝난 사용자부터 오래된 순으로 내보낸다.
+# 같은 DB를 다른 프로세스(API 서버, CLI)도 열 수 있다: 기록 주기마다 캐시한 사용자의 저장소 버전을
+# 확인해 다른 프로세스가 기록한 사용자는 다시 읽는다 (최대 flush_interval만큼 늦게 반영되고,
+# 그 사이 두 프로세스가 같은 카드를 복습하면 나중에 기록한 쪽이 남는다).
+# 잠금은 두 단계: 전역 잠금(_lock)은 캐시 목록과 변경 내역 버퍼만 잠깐 보호하고,
+# 사용자 상태는 사용자별 잠금(UserProgress.lock) 안에서 읽고 바꾼다. 처음 읽는 사용자의
+# 저장소 읽기도 전역 잠금 밖에서 하므로 한 학생의 작업이 다른 학생을 기다리게 하지 않는다.
+class ProgressStore:
+    def __init__(self, backend, flush_interval=2.0, max_pending=500, max_cached_users=2000, rewards=REWARDS):
+        self.backend = backend
+        self.rewards = rewards
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_cached_users = max_cached_users
+        self._cache = OrderedDict()
+        self._pending = []
+        self._lock = threading.Lock()
+        # 저장소에서 읽는 중인 사용자별 잠금 (같은 사용자를 두 번 읽지 않게)
+        self._loading = {}
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flush_loop, name="progress-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # 읽기는 사용자별 메모리 캐시에서 (처음 한 번만 저장소에서 읽음)
+    def get(self, user_id):
+        with self._lock:
+            progress = self._cache.get(user_id)
+            if progress is not None:
+                self._cache.move_to_end(user_id)
+                return progress
+            loading = self._loading.setdefault(user_id, threading.Lock())
+        with loading:
+            with self._lock:
+                progress = self._cache.get(user_id)
+            if progress is not None:
+                return progress
+            progress = self.backend.load(user_id)
+            with self._lock:
+                # 아직 기록되지 않은 변경 내역도 반영
+                for op in self._pending:
+                    if op[1] == user_id:
+                        apply_op(progress, op)
+                self._cache[user_id] = progress
+                self._loading.pop(user_id, None)
+            return progress
+
+    # 사용자 상태를 읽거나 바꿀 때 (with 블록 안에서만 사용)
+    # 잠금을 잡는 사이 캐시에서 내보내졌으면 다시 읽어 온 상태로 다시 잡는다
+    @contextmanager
+    def locked(self, user_id):
+        while True:
+            progress = self.get(user_id)
+            with progress.lock:
+                with self._lock:
+                    current = self._cache.get(user_id) is progress
+                if current:
+                    yield progress
+                    return
+
+    # progress의 잠금을 잡은 상태에서 호출
+    def _record(self, progress, op):
+        apply_op(progress, op)
+        with self._lock:
+            self._pending.append(op)
+            if len(self._pending) >= self.max_pending:
+                self._wakeup.set()
+
+    # 새로 완료한 용어면 True (완료 이벤트도 함께 기록)
+    # 이번 달 완료 수가 상품 단계에 처음 도달하면 획득 기록도 남긴다. 확인과 기록을 같은 잠금 안에서
+    # 하므로 여러 탭에서 동시에 눌러도 한 번만 지급된다.
+    def complete(self, user_id, term_id, now=None, category=""):
+        with self.locked(user_id) as progress:
+            if term_id in progress.all_time_completed:
+                return False
+            completed_at = (now or datetime.now()).isoformat(timespec="seconds")
+            self._record(progress, ("complete", user_id, term_id, completed_at))
+            self._record(progress, ("event", user_id, term_id, completed_at, category))
+            month = completion_month(completed_at)
+            for count in progress.ledger.due_awards(month, self.rewards):
+                self._record(progress, ("award", user_id, month, count, completed_at))
+            return True
+
+    # 간격 반복 복습 결과 기록 (기억한 경우 학습 완료로도 기록, 재복습도 완료 이벤트로 집계)
+    # 카드는 하루에 한 번만 복습한다: 마지막 복습일 이전이나 같은 날의 기록은 무시하고 None 반환
+    # 미래 날짜의 복습은 받지 않는다 (다음 복습일과 마지막 복습일이 미래로 밀려 카드가 잠김)
+    def review(self, user_id, term_id, quality, today, now=None, category=""):
+        if today > date.today():
+            raise ValueError(f"미래 날짜의 복습은 기록할 수 없습니다: {today}")
+        with self.locked(user_id) as progress:
+            card = progress.cards.get(term_id)
+            if card is not None and today.toordinal() <= card.last_review:
+                return None
+            card = srs.review(card or Card(term_id), quality, today)
+            self._record(
+                progress,
+                ("review", user_id, term_id, card.interval, card.ease, card.due, card.reps, card.last_review),
+            )
+            if quality >= QUALITY_GOOD and not self.complete(user_id, term_id, now, category):
+                occurred_at = (now or datetime.now()).isoformat(timespec="seconds")
+                self._record(progress, ("event", user_id, term_id, occurred_at, category))
+            return card
+
+    def set_daily(self, user_id, date_key, term_ids):
+        with self.locked(user_id) as progress:
+            self._record(progress, ("daily", user_id, date_key, list(term_ids)))
+
+    # day의 오늘의 학습 용어: 없거나 전체 카탈로그(full_catalog)에서 사라진 용어가 있으면
+    # 학습 범위(catalog)에서 새로 골라 고정한다. 이미 고정한 날짜는 범위를 좁혀도 바꾸지 않으므로
+    # 범위 밖 용어를 숨기는 것은 호출하는 쪽에서 한다.
+    # 고르는 동안 복습 힙을 꺼냈다 넣으므로 사용자 잠금 안에서 (동시 요청이 덜 찬 날짜를 고정하지 않게)
+    def daily_terms(self, user_id, day, catalog, full_catalog=None):
+        full_catalog = full_catalog or catalog
+        date_key = day.strftime("%Y-%m-%d")
+        with self.locked(user_id) as progress:
+            term_ids = progress.daily_terms.get(date_key)
+            if not term_ids or any(term_id not in full_catalog for term_id in term_ids):
+                term_ids = pick_daily_terms(catalog, progress, user_id, day)
+                self._record(progress, ("daily", user_id, date_key, list(term_ids)))
+            return list(term_ids)
+
+    def reset(self, user_id):
+        with self.locked(user_id) as progress:
+            self._record(progress, ("reset", user_id))
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                ops, self._pending = self._pending, []
+            written = {}
+            if ops:
+                try:
+                    written = self.backend.write_batch(ops)
+                except Exception:
+                    # 실패한 변경 내역은 다음 주기에 다시 시도
+                    with self._lock:
+                        self._pending[:0] = ops
+                    raise
+            self._reload_changed(written)
+            self._evict()
+
+    # 다른 프로세스가 기록한 사용자를 저장소에서 다시 읽어 캐시를 교체 (flush 잠금 안에서 호출)
+    # written: 이번에 기록한 사용자별 (기록 전 버전, 기록 후 버전)
+    def _reload_changed(self, written):
+        with self._lock:
+            cached = list(self._cache.items())
+        if not cached:
+            return
+        for user_id, progress in cached:
+            versions = written.get(user_id)
+            # 기록 전 버전이 읽어 온 버전과 같으면 그 사이 다른 프로세스의 기록이 없었음
+            if versions is not None and versions[0] == progress.stored_version:
+                progress.stored_version = versions[1]
+        current = self.backend.versions([user_id for user_id, _ in cached])
+        for user_id, progress in cached:
+            if current[user_id] == progress.stored_version:
+                continue
+            # 다른 스레드가 쓰고 있는 사용자는 다음 주기에 다시 확인 (잠금을 기다리지 않음)
+            if not progress.lock.acquire(blocking=False):
+                continue
+            try:
+                fresh = self.backend.load(user_id)
+                with self._lock:
+                    for op in self._pending:
+                        if op[1] == user_id:
+                            apply_op(fresh, op)
+                    if self._cache.get(user_id) is progress:
+                        self._cache[user_id] = fresh
+            finally:
+                progress.lock.release()
+
+    def _evict(self):
+        with self._lock:
+            excess = len(self._cache) - self.max_cached_users
+            if excess <= 0:
+                return
+            pending_users = {op[1] for op in self._pending}
+            for user_id, progress in list(self._cache.items()):
+                if excess <= 0:
+                    break
+                # 다른 스레드가 쓰고 있는 사용자는 건너뜀 (잠금을 기다리지 않음)
+                if user_id in pending_users or not progress.lock.acquire(blocking=False):
+                    continue
+                try:
+                    del self._cache[user_id]
+                    excess -= 1
+                finally:
+                    progress.lock.release()
+
+    def cached_users(self):
+        with self._lock:
+            return len(self._cache)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.flush_interval)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+        self.backend.close()
@@ -0,0 +1,82 @@
+import hashlib
+import random
+
+# 퀴즈 모드: 영어 용어를 보여 주고 한글 뜻을 고르는 객관식 문제
+# 오답 보기는 같은 카테고리 용어에서 뽑는다. 카테고리별 보기 후보(pool)는 카탈로그당
+# 한 번만 만들고, 한 회차 문제 생성과 채점은 모두 한 번에 처리한다.
+DEFAULT_CHOICES = 4
+
+
+class DistractorPools:
+    def __init__(self, catalog, n_choices=DEFAULT_CHOICES):
+        self.catalog = catalog
+        self.n_choices = n_choices
+        # 노드별 하위 용어 id (상위 노드에는 모든 하위 카테고리 용어가 포함됨)
+        node_terms = [[] for _ in catalog.node_paths]
+        for term_id in catalog.ids:
+            node_id = catalog.term_node(term_id)
+            while node_id >= 0:
+                node_terms[node_id].append(term_id)
+                node_id = catalog.node_parents[node_id]
+        # 말단 노드마다 보기가 충분한 가장 가까운 조상 노드의 후보를 쓴다
+        self._pools = {}
+        for leaf_id in set(catalog.term_node(term_id) for term_id in catalog.ids):
+            node_id = leaf_id
+            while len(node_terms[node_id]) < n_choices and catalog.node_parents[node_id] >= 0:
+                node_id = catalog.node_parents[node_id]
+            self._pools[leaf_id] = node_terms[node_id]
+        self._all_ids = catalog.ids
+
+    def pool_for(self, term_id):
+        return self._pools[self.catalog.term_node(term_id)]
+
+    # 정답과 뜻이 다른 오답 보기 n개
+    def distractors(self, term_id, n, rng):
+        answer = self.catalog.get(term_id)["definition"]
+        picked = []
+        seen = {answer}
+        for pool in (self.pool_for(term_id), self._all_ids):
+            if len(pool) <= 4 * n:
+                candidates = rng.sample(pool, len(pool))
+            else:
+                candidates = (pool[rng.randrange(len(pool))] for _ in range(4 * n))
+            for candidate in candidates:
+                definition = self.catalog.get(candidate)["definition"]
+                if definition not in seen:
+                    seen.add(definition)
+                    picked.append(candidate)
+                    if len(picked) == n:
+                        return picked
+        return picked
+
+
+class Question:
+    __slots__ = ("term_id", "choices", "answer_index")
+
+    def __init__(self, term_id, choices, answer_index):
+        self.term_id = term_id
+        self.choices = choices
+        self.answer_index = answer_index
+
+
+# 시험 코드가 같으면 모든 학생에게 같은 문제와 보기 순서가 나온다
+def quiz_rng(code):
+    if not code:
+        return random.Random()
+    return random.Random(int.from_bytes(hashlib.sha256(code.encode("utf-8")).digest()[:8], "big"))
+
+
+def make_round(pools, term_ids, rng, n_choices=None):
+    n_choices = n_choices or pools.n_choices
+    questions = []
+    for term_id in term_ids:
+        choices = [term_id] + pools.distractors(term_id, n_choices - 1, rng)
+        rng.shuffle(choices)
+        questions.append(Question(term_id, choices, choices.index(term_id)))
+    return questions
+
+
+# 한 회차 전체 채점: answers는 문제별 선택한 보기 번호 (고르지 않았으면 None)
+def grade_round(questions, answers):
+    results = [answer == question.answer_index for question, answer in zip(questions, answers)]
+    return sum(results), results
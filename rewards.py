@@ -0,0 +1,45 @@
+# 월간 완료 횟수별 상품 (완료 횟수: 상품명)
+REWARDS = {
+    10: "귀여운 메모지 세트",
+    15: "프리미엄 노트",
+    20: "스터디 플래너",
+    25: "고급 만년필 세트",
+    30: "프리미엄 학습 키트"
+}
+
+
+# 다음 상품까지 필요한 횟수 (모두 획득했으면 None)
+def next_reward(completions, rewards=REWARDS):
+    return next((count for count in sorted(rewards) if count > completions), None)
+
+
+# 월별 완료 장부 (사용자 한 명)
+# 완료할 때마다 그 달의 칸만 1 올리므로 달이 바뀌면 새 칸에서 0부터 다시 센다.
+# 이번 달 완료 수는 딕셔너리 조회 한 번이고, 상품은 달마다 단계별로 처음 도달한 시각을 한 번만 기록한다.
+class MonthlyLedger:
+    __slots__ = ("completions", "awards")
+
+    def __init__(self):
+        # {월("YYYY-MM"): 완료 수}
+        self.completions = {}
+        # {월: {필요 횟수: 처음 도달한 시각}}
+        self.awards = {}
+
+    def count(self, month):
+        return self.completions.get(month, 0)
+
+    def add(self, month, n=1):
+        self.completions[month] = self.completions.get(month, 0) + n
+
+    def awarded(self, month):
+        return self.awards.get(month, {})
+
+    # 이미 기록된 단계는 덮어쓰지 않음 (처음 도달한 시각 유지)
+    def award(self, month, count, awarded_at):
+        self.awards.setdefault(month, {}).setdefault(count, awarded_at)
+
+    # 도달했지만 아직 기록되지 않은 상품 단계
+    def due_awards(self, month, rewards=REWARDS):
+        completions = self.count(month)
+        awarded = self.awarded(month)
+        return [count for count in sorted(rewards) if count <= completions and count not in awarded]
@@ -0,0 +1,131 @@
+import argparse
+import hashlib
+import json
+import random
+from datetime import date, timedelta
+
+# 오늘의 학습 용어 스케줄러
+# 사용자별 시드로 정한 순열을 따라 날짜마다 k개씩 잘라 제공한다.
+# 순열은 Feistel 네트워크로 위치마다 바로 계산하므로 목록으로 만들지 않는다
+# (사용자당 메모리는 라운드 키 몇 개, 하루치 선택은 O(k)).
+# 같은 사용자·같은 카탈로그라면 세션이나 서버가 달라도 항상 같은 용어가 나온다.
+DAILY_COUNT = 6
+FEISTEL_ROUNDS = 4
+# 새 용어를 찾을 때 순열에서 확인할 최대 위치 수 (거의 다 학습한 사용자도 덱 크기와 무관하게 끝남)
+NEW_TERM_PROBES = 1024
+MASK64 = (1 << 64) - 1
+
+
+def user_seed(user_id):
+    return int.from_bytes(hashlib.sha256(user_id.encode("utf-8")).digest()[:8], "big")
+
+
+def _mix(x):
+    # splitmix64 마무리 단계 (라운드 함수용 정수 해시)
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK64
+    return x ^ (x >> 31)
+
+
+class DailyScheduler:
+    def __init__(self, catalog, user_id, k=DAILY_COUNT):
+        self.catalog = catalog
+        self.k = k
+        n = len(catalog)
+        # n 이상인 2^(2*half) 크기 정의역에서 순열을 만들고 n 밖의 값은 다시 돌린다(cycle walking)
+        self._half = max(1, ((n - 1).bit_length() + 1) // 2) if n > 1 else 1
+        rng = random.Random(user_seed(user_id))
+        self._keys = [rng.getrandbits(64) for _ in range(FEISTEL_ROUNDS)]
+
+    def _permute(self, pos):
+        half_mask = (1 << self._half) - 1
+        left, right = pos >> self._half, pos & half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & half_mask)
+        return (left << self._half) | right
+
+    def _term_at(self, pos):
+        n = len(self.catalog)
+        value = pos % n
+        while True:
+            value = self._permute(value)
+            if value < n:
+                return self.catalog.ids[value]
+
+    # 날짜별로 순열의 연속 구간을 배정 (연속한 날짜끼리는 겹치지 않음)
+    def terms_for(self, day):
+        count = min(self.k, len(self.catalog))
+        start = day.toordinal() * self.k
+        return [self._term_at(start + i) for i in range(count)]
+
+    # 날짜 구간부터 순서대로 최대 probes개 위치를 보며 exclude에 해당하지 않는 용어 count개까지
+    def new_terms_for(self, day, count, exclude, probes=NEW_TERM_PROBES):
+        start = day.toordinal() * self.k
+        picked = []
+        for i in range(min(len(self.catalog), probes)):
+            if len(picked) >= count:
+                break
+            term_id = self._term_at(start + i)
+            if not exclude(term_id):
+                picked.append(term_id)
+        return picked
+
+    # 학기 전체 스케줄 등 여러 날짜를 한 번에 계산
+    def schedule(self, start, days):
+        return {
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d"): self.terms_for(start + timedelta(days=offset))
+            for offset in range(days)
+        }
+
+
+# 오늘의 학습 카드 구성: 복습 예정 카드를 먼저, 남는 자리는 새 용어로 채움
+# 새 용어가 모자라면(거의 다 학습해 NEW_TERM_PROBES개 위치 안에 없는 경우) 날짜 구간의 용어로 채움
+def pick_daily_terms(catalog, progress, user_id, day, k=DAILY_COUNT):
+    picked = progress.due_index.due_terms(day, k, include=catalog.__contains__)
+    scheduler = DailyScheduler(catalog, user_id, k)
+    seen = set(picked)
+
+    def is_known(term_id):
+        return term_id in seen or term_id in progress.cards or term_id in progress.all_time_completed
+
+    picked += scheduler.new_terms_for(day, k - len(picked), is_known)
+    if len(picked) < k:
+        seen.update(picked)
+        picked += scheduler.new_terms_for(day, k - len(picked), seen.__contains__)
+    return picked
+
+
+# 사용자별 기본 새 용어 순서 (순열의 날짜 구간 그대로)
+# 화면에 나오는 오늘의 학습은 여기에 복습 예정 카드를 앞에 넣고 이미 학습한 용어를 건너뛴
+# pick_daily_terms 결과이므로, 학습 기록이 있는 사용자에게는 이 값과 다를 수 있다
+def precompute_schedules(catalog, user_ids, start, days, k=DAILY_COUNT):
+    return {user_id: DailyScheduler(catalog, user_id, k).schedule(start, days) for user_id in user_ids}
+
+
+# 배치 작업: python scheduler.py --user alice --user bob --start 2026-03-02 --days 112
+def main(argv=None):
+    import term_store
+
+    parser = argparse.ArgumentParser(
+        description="사용자별 기본 새 용어 순서를 미리 계산합니다 "
+                    "(복습 예정 카드와 이미 학습한 용어는 반영하지 않음)."
+    )
+    parser.add_argument("--terms", default=term_store.default_terms_path())
+    parser.add_argument("--user", action="append", required=True)
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--days", type=int, default=112)
+    parser.add_argument("--out", default="-")
+    args = parser.parse_args(argv)
+
+    catalog = term_store.load_catalog(args.terms)
+    schedules = precompute_schedules(catalog, args.user, args.start, args.days)
+    text = json.dumps(schedules, ensure_ascii=False)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import heapq
+import re
+from collections import Counter
+
+# 용어 검색 인덱스
+# 영어 용어는 소문자 3-gram, 한글 뜻은 자모로 분해한 뒤 3-gram으로 색인한다.
+# 질의도 같은 방식으로 나눠 공통 n-gram 수로 후보를 모으고 Dice 계수로 순위를 매기므로
+# 오타나 받침 하나가 틀린 질의도 찾을 수 있다. 인덱스는 카탈로그를 불러올 때 한 번만 만든다.
+NGRAM = 3
+PAD = "$"
+# 후보는 드문 n-gram부터 모으고, 흔한 n-gram(전체 문서의 2% 이상)이나 후보가 MAX_CANDIDATES개를
+# 넘은 뒤의 n-gram은 이미 모은 후보의 점수만 올린다 (질의당 비용이 덱 크기에 비례하지 않음)
+COMMON_GRAM_RATIO = 0.02
+MAX_CANDIDATES = 2000
+# 부분 문자열 가산점은 Dice 점수 상위 limit × BONUS_POOL개에만 확인
+BONUS_POOL = 5
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+_NON_WORD = re.compile(r"[^0-9a-zㄱ-ㆎ가-힣]+")
+
+
+# 한글 음절을 초성·중성·종성 자모로 분해 (그 외 문자는 그대로)
+def decompose_hangul(text):
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            chars.append(CHOSEONG[offset // 588])
+            chars.append(JUNGSEONG[(offset % 588) // 28])
+            if offset % 28:
+                chars.append(JONGSEONG[offset % 28])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def normalize(text):
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def ngrams(text):
+    grams = Counter()
+    for word in text.split():
+        padded = PAD * (NGRAM - 1) + word + PAD
+        for i in range(len(padded) - NGRAM + 1):
+            grams[padded[i:i + NGRAM]] += 1
+    return grams
+
+
+class _NgramIndex:
+    def __init__(self, texts):
+        self.postings = {}
+        self.sizes = []
+        for position, text in enumerate(texts):
+            grams = ngrams(text)
+            self.sizes.append(sum(grams.values()))
+            for gram, count in grams.items():
+                self.postings.setdefault(gram, {})[position] = count
+
+    # {문서 위치: Dice 계수}
+    def score(self, query_text):
+        query = ngrams(query_text)
+        if not query:
+            return {}
+        query_size = sum(query.values())
+        grams = [gram for gram in query if gram in self.postings]
+        grams.sort(key=lambda gram: len(self.postings[gram]))
+        # 작은 덱에서는 모든 n-gram으로 후보를 모은다 (후보 수 상한이 비용을 막아 줌)
+        limit = max(MAX_CANDIDATES, int(len(self.sizes) * COMMON_GRAM_RATIO))
+        common = Counter()
+        for gram in grams:
+            posting = self.postings[gram]
+            wanted = query[gram]
+            # 가장 드문 n-gram은 흔하더라도 후보를 모으는 데 쓴다 (후보가 하나도 없을 때)
+            if common and (len(posting) > limit or len(common) >= MAX_CANDIDATES):
+                for position in common:
+                    count = posting.get(position)
+                    if count:
+                        common[position] += min(count, wanted)
+                continue
+            for position, count in posting.items():
+                if position in common or len(common) < MAX_CANDIDATES:
+                    common[position] += min(count, wanted)
+        return {
+            position: 2 * shared / (query_size + self.sizes[position])
+            for position, shared in common.items()
+        }
+
+
+class SearchIndex:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._terms = [normalize(term["term"]) for term in catalog.terms]
+        self._definitions = [normalize(term["definition"]) for term in catalog.terms]
+        self._term_index = _NgramIndex(self._terms)
+        self._definition_index = _NgramIndex(decompose_hangul(text) for text in self._definitions)
+
+    # 점수가 높은 순으로 (용어 id, 점수) 최대 limit개
+    # include: 결과에 넣을 용어 id인지 (학습 범위만 찾을 때, 인덱스는 전체 카탈로그 하나만 둠)
+    def search(self, query, limit=20, min_score=0.2, include=None):
+        text = normalize(query)
+        if not text:
+            return []
+        scores = self._term_index.score(text)
+        for position, score in self._definition_index.score(decompose_hangul(text)).items():
+            if score > scores.get(position, 0.0):
+                scores[position] = score
+        if include is not None:
+            ids = self.catalog.ids
+            scores = {position: score for position, score in scores.items() if include(ids[position])}
+        # 부분 문자열로 그대로 포함되면 가산점 (Dice 점수 상위 후보만 확인)
+        pool = heapq.nlargest(limit * BONUS_POOL, scores.items(), key=lambda item: item[1])
+        boosted = []
+        for position, score in pool:
+            if text in self._terms[position] or text in self._definitions[position]:
+                score += 0.5
+            boosted.append((position, score))
+        best = heapq.nlargest(limit, boosted, key=lambda item: item[1])
+        return [(self.catalog.ids[position], score) for position, score in best if score >= min_score]
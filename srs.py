@@ -0,0 +1,85 @@
+import heapq
+
+# 간격 반복(SM-2) 복습 스케줄러
+# 카드마다 복습 간격·난이도 계수(ease)·다음 복습일을 두고,
+# 다음 복습일 기준 힙으로 오늘 복습할 카드를 O(log n)에 꺼낸다
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# 버튼별 회상 품질 (0~5)
+QUALITY_GOOD = 4
+QUALITY_HARD = 2
+
+
+class Card:
+    __slots__ = ("term_id", "interval", "ease", "due", "reps", "last_review")
+
+    def __init__(self, term_id, interval=0, ease=DEFAULT_EASE, due=0, reps=0, last_review=0):
+        self.term_id = term_id
+        self.interval = interval
+        self.ease = ease
+        # 다음 복습일 (date.toordinal() 값)
+        self.due = due
+        self.reps = reps
+        # 마지막으로 복습한 날 (date.toordinal() 값, 복습 전이면 0)
+        self.last_review = last_review
+
+
+# SM-2 규칙으로 복습 결과를 반영한 새 카드 반환
+def review(card, quality, today):
+    if quality < 3:
+        reps = 0
+        interval = 1
+    else:
+        reps = card.reps + 1
+        if reps == 1:
+            interval = 1
+        elif reps == 2:
+            interval = 6
+        else:
+            interval = max(1, round(card.interval * card.ease))
+    ease = card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return Card(card.term_id, interval, max(MIN_EASE, ease), today.toordinal() + interval, reps, today.toordinal())
+
+
+# 다음 복습일 기준 최소 힙
+# 카드가 갱신되면 새 항목을 넣고, 예전 항목은 꺼낼 때 버린다(lazy deletion)
+class DueIndex:
+    def __init__(self, cards=None):
+        self._cards = cards if cards is not None else {}
+        self._heap = [(card.due, card.term_id) for card in self._cards.values()]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def push(self, card):
+        self._cards[card.term_id] = card
+        heapq.heappush(self._heap, (card.due, card.term_id))
+
+    def clear(self):
+        self._cards.clear()
+        self._heap.clear()
+
+    def _is_current(self, due, term_id):
+        card = self._cards.get(term_id)
+        return card is not None and card.due == due
+
+    # today까지 복습 예정인 카드 중 가장 급한 n개 (include로 범위 제한 가능)
+    # 같은 카드가 같은 복습일로 두 번 들어간 항목은 하나만 남긴다
+    def due_terms(self, today, n, include=None):
+        today_ordinal = today.toordinal()
+        picked = []
+        skipped = []
+        seen = set()
+        while self._heap and len(picked) < n and self._heap[0][0] <= today_ordinal:
+            due, term_id = heapq.heappop(self._heap)
+            if term_id in seen or not self._is_current(due, term_id):
+                continue
+            seen.add(term_id)
+            skipped.append((due, term_id))
+            if include is None or include(term_id):
+                picked.append(term_id)
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return picked
@@ -0,0 +1,83 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from catalog import CATEGORY_SEP
+
+# 학습 통계 롤업
+# 완료 이벤트(시각, 용어 id, 카테고리)가 들어올 때마다 일/주/월/카테고리별 집계를
+# 바로 갱신하므로, 통계 화면은 이력 전체를 다시 훑지 않고 집계만 읽는다.
+# version은 이벤트가 추가될 때마다 증가하며 그래프 캐시 키로 쓴다.
+
+
+def day_key(moment):
+    return moment.strftime("%Y-%m-%d")
+
+
+def week_key(moment):
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(moment):
+    return moment.strftime("%Y-%m")
+
+
+class StatsRollup:
+    __slots__ = ("daily", "weekly", "monthly", "by_category", "total", "version")
+
+    def __init__(self):
+        self.daily = Counter()
+        self.weekly = Counter()
+        self.monthly = Counter()
+        self.by_category = Counter()
+        self.total = 0
+        self.version = 0
+
+    # occurred_at: ISO 형식 문자열, category: 카테고리 경로
+    def add(self, occurred_at, term_id, category):
+        moment = datetime.fromisoformat(occurred_at)
+        self.daily[day_key(moment)] += 1
+        self.weekly[week_key(moment)] += 1
+        self.monthly[month_key(moment)] += 1
+        if category:
+            self.by_category[category] += 1
+        self.total += 1
+        self.version += 1
+
+    # 최근 days일 일별 완료 수 (빈 날짜는 0)
+    def recent_days(self, today, days=30):
+        labels = [day_key(today - timedelta(days=offset)) for offset in range(days - 1, -1, -1)]
+        return labels, [self.daily[label] for label in labels]
+
+    # 최근 weeks주 주별 완료 수
+    def recent_weeks(self, today, weeks=12):
+        labels = [week_key(today - timedelta(weeks=offset)) for offset in range(weeks - 1, -1, -1)]
+        return labels, [self.weekly[label] for label in labels]
+
+    # 최근 months개월 월별 완료 수
+    def recent_months(self, today, months=12):
+        labels = []
+        year, month = today.year, today.month
+        for _ in range(months):
+            labels.append(f"{year}-{month:02d}")
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        labels.reverse()
+        return labels, [self.monthly[label] for label in labels]
+
+    # 최상위 카테고리별 완료 수 (카테고리 수에 비례)
+    def top_categories(self):
+        totals = Counter()
+        for category, count in self.by_category.items():
+            totals[category.split(CATEGORY_SEP, 1)[0]] += count
+        return totals
+
+    # 그래프용 (라벨, 값) 목록 (kind: daily / weekly / monthly / category)
+    def series(self, kind, today):
+        if kind == "daily":
+            return self.recent_days(today)
+        if kind == "weekly":
+            return self.recent_weeks(today)
+        if kind == "monthly":
+            return self.recent_months(today)
+        top = self.top_categories().most_common()
+        return [name for name, _ in top], [count for _, count in top]
@@ -0,0 +1,64 @@
+import html
+import os
+import re
+
+from rewards import REWARDS
+
+# 화면에 반복해서 그리는 정적 HTML 조각
+# 스타일시트와 카드 HTML은 한 번 만들어 두고 rerun마다 같은 문자열을 다시 보낸다.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STYLE_PATH = os.path.join(STATIC_DIR, "style.css")
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"\s*([{};:,>])\s*")
+
+
+# 주석·공백을 걷어낸 <style> 태그 (페이로드 축소용)
+def load_style(path=STYLE_PATH):
+    with open(path, encoding="utf-8") as f:
+        css = f.read()
+    css = _COMMENT_RE.sub("", css)
+    css = _PUNCT_RE.sub(r"\1", _SPACE_RE.sub(" ", css)).replace(";}", "}")
+    return f"<style>{css.strip()}</style>"
+
+
+# badge, label: 이스케이프하지 않고 붙이는 고정 문구 (용어 뒤 / 뜻 앞)
+def term_card_html(term, badge="", path=None, label=""):
+    parts = [
+        '<div class="term-card">',
+        f'<p style="font-weight:bold; font-size:1.1rem;">{html.escape(term["term"])}{badge}</p>',
+        f'<p style="font-weight:bold; font-size:1rem;">{label}{html.escape(term["definition"])}</p>',
+    ]
+    if path:
+        parts.append(f'<p style="font-size:0.85rem;">{html.escape(" › ".join(path))}</p>')
+    parts.append("</div>")
+    return "".join(parts)
+
+
+# 카탈로그의 용어 카드 HTML (처음 그릴 때 만들어 두고 재사용)
+class TermCardTemplates:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._cards = {}
+
+    def card(self, term_id):
+        card_html = self._cards.get(term_id)
+        if card_html is None:
+            card_html = self._cards[term_id] = term_card_html(self.catalog.get(term_id))
+        return card_html
+
+    def __len__(self):
+        return len(self._cards)
+
+
+# 상품 카드는 단계마다 (달성, 미달성) 두 가지 모양만 있으므로 미리 모두 만들어 둔다
+def reward_cards(rewards=REWARDS):
+    cards = {}
+    for count, reward in sorted(rewards.items()):
+        title = f"<h3>{count}회 완료 - {html.escape(reward)}</h3>"
+        cards[count] = (
+            f'<div class="term-card">{title}<p>아직 획득하지 못했습니다</p></div>',
+            f'<div class="stats-card">{title}<p>획득 완료! 🎉</p></div>',
+        )
+    return cards
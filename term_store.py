@@ -0,0 +1,167 @@
+import argparse
+import csv
+import os
+import shutil
+import sqlite3
+import threading
+
+from catalog import CATEGORY_SEP, TermCatalog
+
+# 용어 저장소: CSV 또는 SQLite 파일에서 카테고리 트리를 읽어 온다
+DEFAULT_TERMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "medical_terms.csv")
+# 가져오기로 용어를 더하는 작업용 덱 (git에 올리지 않음, 처음 가져올 때 기본 용어 파일을 복사해 만든다)
+DEFAULT_DECK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "deck.csv")
+FIELDS = ("id", "category", "term", "definition")
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+_deck_lock = threading.Lock()
+
+
+def is_sqlite(path):
+    return path.endswith(SQLITE_SUFFIXES)
+
+
+# 읽을 용어 파일: MEDTERM_TERMS_PATH, 없으면 작업용 덱, 작업용 덱도 없으면 기본 용어 파일
+def default_terms_path():
+    path = os.environ.get("MEDTERM_TERMS_PATH")
+    if path:
+        return path
+    return DEFAULT_DECK_PATH if os.path.exists(DEFAULT_DECK_PATH) else DEFAULT_TERMS_PATH
+
+
+# 가져오기가 덧붙일 용어 파일: MEDTERM_TERMS_PATH를 지정했으면 그 파일, 아니면 작업용 덱
+# (git으로 관리하는 기본 용어 파일은 고치지 않으므로 배포한 작업 트리가 바뀌지 않는다)
+def writable_terms_path():
+    path = os.environ.get("MEDTERM_TERMS_PATH")
+    if path:
+        return path
+    with _deck_lock:
+        if not os.path.exists(DEFAULT_DECK_PATH):
+            shutil.copyfile(DEFAULT_TERMS_PATH, DEFAULT_DECK_PATH + ".tmp")
+            os.replace(DEFAULT_DECK_PATH + ".tmp", DEFAULT_DECK_PATH)
+    return DEFAULT_DECK_PATH
+
+
+def _top_category(category):
+    return category.split(CATEGORY_SEP, 1)[0]
+
+
+def _iter_csv_rows(path, categories):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if categories is not None and _top_category(row["category"]) not in categories:
+                continue
+            row["id"] = int(row["id"])
+            yield row
+
+
+def _iter_sqlite_rows(path, categories):
+    query = "SELECT id, category, term, definition FROM terms"
+    params = []
+    if categories is not None:
+        # 최상위 카테고리 접두어로 필터링: "이름/"로 시작하는 값은 "이름/" 이상 "이름0" 미만
+        # ("0"은 구분자 "/" 다음 문자)이므로 범위 조건으로 써야 category 인덱스를 쓴다
+        clauses = []
+        for name in categories:
+            clauses.append("category = ? OR (category >= ? AND category < ?)")
+            params.extend([name, name + CATEGORY_SEP, name + chr(ord(CATEGORY_SEP) + 1)])
+        query += " WHERE " + (" OR ".join(clauses) if clauses else "0")
+    query += " ORDER BY id"
+    conn = sqlite3.connect(path)
+    try:
+        for term_id, category, term, definition in conn.execute(query, params):
+            yield {"id": term_id, "category": category, "term": term, "definition": definition}
+    finally:
+        conn.close()
+
+
+# categories: 불러올 최상위 카테고리 목록 (None이면 전체)
+def iter_rows(path=DEFAULT_TERMS_PATH, categories=None):
+    if categories is not None:
+        categories = set(categories)
+    if is_sqlite(path):
+        return _iter_sqlite_rows(path, categories)
+    return _iter_csv_rows(path, categories)
+
+
+# 최상위 카테고리 목록 (파일에 등장한 순서 유지)
+def list_categories(path=DEFAULT_TERMS_PATH):
+    if is_sqlite(path):
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute("SELECT category FROM terms GROUP BY category ORDER BY min(id)")
+            categories = [category for (category,) in rows]
+        finally:
+            conn.close()
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            categories = [row["category"] for row in csv.DictReader(f)]
+    return list(dict.fromkeys(_top_category(category) for category in categories))
+
+
+def load_catalog(path=DEFAULT_TERMS_PATH, categories=None):
+    return TermCatalog(iter_rows(path, categories), scoped=categories is not None)
+
+
+# 용어 행 추가 (id가 이미 정해진 행, 가져오기에서 묶음 단위로 호출)
+def append_rows(path, rows):
+    if is_sqlite(path):
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO terms (id, category, term, definition) VALUES (?, ?, ?, ?)",
+                    ((row["id"], row["category"], row["term"], row["definition"]) for row in rows),
+                )
+        finally:
+            conn.close()
+        return
+    # 마지막 줄에 줄바꿈이 없으면 먼저 붙인다
+    needs_newline = False
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        if needs_newline:
+            f.write("\n")
+        writer = csv.DictWriter(f, fieldnames=FIELDS, lineterminator="\n", extrasaction="ignore")
+        writer.writerows(rows)
+
+
+# 대용량 덱 배포용: CSV 용어 파일을 인덱스가 있는 SQLite 파일로 변환
+# (MEDTERM_TERMS_PATH를 만든 .db 파일로 지정하면 앱이 범위 필터를 SQL로 처리)
+def build_sqlite(csv_path, db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS terms")
+            conn.execute(
+                "CREATE TABLE terms (id INTEGER PRIMARY KEY, category TEXT NOT NULL, "
+                "term TEXT NOT NULL, definition TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX idx_terms_category ON terms (category)")
+            conn.executemany(
+                "INSERT INTO terms (id, category, term, definition) VALUES (?, ?, ?, ?)",
+                ((row["id"], row["category"], row["term"], row["definition"])
+                 for row in _iter_csv_rows(csv_path, None)),
+            )
+    finally:
+        conn.close()
+
+
+# python term_store.py data/medical_terms.csv data/medical_terms.db
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV 용어 파일을 SQLite 용어 파일로 변환합니다.")
+    parser.add_argument("csv_path")
+    parser.add_argument("db_path")
+    args = parser.parse_args(argv)
+    if not is_sqlite(args.db_path):
+        parser.error(f"db_path는 {', '.join(SQLITE_SUFFIXES)} 중 하나로 끝나야 합니다")
+    build_sqlite(args.csv_path, args.db_path)
+    print(f"{len(load_catalog(args.db_path))}개 용어를 {args.db_path}에 저장했습니다")
+
+
+if __name__ == "__main__":
+    main()
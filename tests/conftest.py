@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트의 모듈(app.py 옆의 평탄한 구조)을 그대로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import TermCatalog  # noqa: E402
+from progress_store import JsonFileBackend, ProgressStore, SQLiteBackend  # noqa: E402
+
+
+# 카테고리 3개 × 말단 2개에 용어를 고르게 나눈 작은 카탈로그
+def make_catalog(n_terms=60):
+    return TermCatalog(
+        {
+            "category": f"분야{i % 3}/세부{i % 2}",
+            "term": f"term{i}",
+            "definition": f"뜻{i}",
+        }
+        for i in range(n_terms)
+    )
+
+
+@pytest.fixture
+def catalog():
+    return make_catalog()
+
+
+# 두 저장소 구현을 같은 테스트로 확인
+@pytest.fixture(params=["sqlite", "json"])
+def open_store(request, tmp_path):
+    stores = []
+
+    def open_store(**kwargs):
+        if request.param == "sqlite":
+            backend = SQLiteBackend(str(tmp_path / "progress.db"))
+        else:
+            backend = JsonFileBackend(str(tmp_path / "progress_json"))
+        # 백그라운드 기록은 테스트가 flush로 직접 부른다
+        kwargs.setdefault("flush_interval", 60.0)
+        store = ProgressStore(backend, **kwargs)
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta
+
+from conftest import make_catalog
+from packs import apply_sync, week_schedules
+from srs import QUALITY_GOOD, QUALITY_HARD
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def record(term_id, days_ago, quality=QUALITY_GOOD):
+    return {
+        "term_id": term_id,
+        "quality": quality,
+        "reviewed_at": (NOW - timedelta(days=days_ago)).isoformat(),
+    }
+
+
+def test_resent_batch_is_stale(open_store, catalog):
+    store = open_store()
+    batch = [record(1, 3), record(2, 2), record(1, 1)]
+    report = apply_sync(store, catalog, "a", batch, now=NOW)
+    assert (report.applied, report.stale, report.invalid) == (3, 0, 0)
+    card = store.get("a").cards[1]
+    report = apply_sync(store, catalog, "a", batch, now=NOW)
+    assert (report.applied, report.stale) == (0, 3)
+    assert store.get("a").cards[1] is card
+
+
+def test_older_offline_review_does_not_overwrite_online_one(open_store, catalog):
+    store = open_store()
+    online = store.review("a", 5, QUALITY_GOOD, date.today(), now=NOW)
+    report = apply_sync(store, catalog, "a", [record(5, 2, QUALITY_HARD)], now=NOW)
+    assert (report.applied, report.stale) == (0, 1)
+    card = store.get("a").cards[5]
+    assert (card.due, card.ease, card.last_review) == (online.due, online.ease, online.last_review)
+
+
+def test_invalid_and_duplicate_records_are_counted(open_store, catalog):
+    store = open_store()
+    batch = [
+        record(1, 1),
+        record(1, 1),
+        record(True, 1),
+        {**record(2, 1), "quality": True},
+        {**record(2, 1), "quality": 6},
+        record(len(catalog) + 10, 1),
+        {**record(3, 1), "reviewed_at": "어제"},
+        {**record(3, 0), "reviewed_at": (NOW + timedelta(days=2)).isoformat()},
+        "not a record",
+    ]
+    report = apply_sync(store, catalog, "a", batch, now=NOW)
+    assert (report.applied, report.duplicates, report.invalid, report.stale) == (1, 1, 7, 0)
+    assert len(report.errors) == 7
+    assert list(store.get("a").cards) == [1]
+
+
+def test_week_schedules_do_not_pin_or_repeat(open_store):
+    # 2주 × 하루 용어 수보다 넉넉한 카탈로그 (모자라면 이미 넣은 용어로 채움)
+    catalog = make_catalog(500)
+    store = open_store()
+    start = date.today()
+    store.review("a", 4, QUALITY_HARD, start, now=NOW)
+    schedules = week_schedules(catalog, store, "a", start, 2)
+    days = [term_ids for week in schedules.values() for term_ids in week.values()]
+    flat = [term_id for term_ids in days for term_id in term_ids]
+    assert len(days) == 14
+    # 복습 카드는 다음 복습일에 한 번만 나온다
+    assert flat.count(4) == 1
+    assert len(set(flat)) == len(flat)
+    # 학습팩을 만들어도 저장소의 오늘의 용어는 고정되지 않는다
+    assert not store.get("a").daily_terms
@@ -0,0 +1,139 @@
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from progress_store import UserProgress, apply_op
+from srs import QUALITY_GOOD, QUALITY_HARD
+
+TODAY = date.today()
+NOW = datetime.now().replace(microsecond=0)
+MONTH = NOW.strftime("%Y-%m")
+
+
+def snapshot(progress):
+    return {
+        "completed": sorted(progress.all_time_completed),
+        "monthly": dict(progress.ledger.completions),
+        "awards": {month: dict(awards) for month, awards in progress.ledger.awards.items()},
+        "daily": {key: list(term_ids) for key, term_ids in progress.daily_terms.items()},
+        "cards": {
+            term_id: (card.interval, card.ease, card.due, card.reps, card.last_review)
+            for term_id, card in progress.cards.items()
+        },
+        "events": (progress.stats.total, dict(progress.stats.daily), dict(progress.stats.by_category)),
+    }
+
+
+def test_apply_op_kinds():
+    progress = UserProgress()
+    apply_op(progress, ("complete", "a", 3, "2026-03-02T09:00:00"))
+    apply_op(progress, ("complete", "a", 3, "2026-03-02T10:00:00"))
+    apply_op(progress, ("award", "a", "2026-03", 10, "2026-03-02T09:00:00"))
+    apply_op(progress, ("daily", "a", "2026-03-02", [1, 2, 3]))
+    apply_op(progress, ("review", "a", 3, 1, 2.5, 739000, 1, 738999))
+    apply_op(progress, ("event", "a", 3, "2026-03-02T09:00:00", "분야0/세부1"))
+    assert list(progress.all_time_completed) == [3]
+    assert progress.ledger.count("2026-03") == 1
+    assert progress.ledger.awarded("2026-03") == {10: "2026-03-02T09:00:00"}
+    assert progress.daily_terms == {"2026-03-02": [1, 2, 3]}
+    assert progress.cards[3].due == 739000
+    assert progress.stats.total == 1
+    apply_op(progress, ("reset", "a"))
+    # 초기화해도 월별 장부와 완료 이벤트 집계는 남는다
+    assert len(progress.all_time_completed) == 0 and not progress.daily_terms and not progress.cards
+    assert progress.ledger.count("2026-03") == 1 and progress.stats.total == 1
+
+
+def test_backend_round_trip_matches_cache(open_store, catalog):
+    store = open_store(rewards={2: "상품"})
+    for term_id in (1, 2, 3):
+        store.complete("u/1", term_id, now=NOW, category=catalog.get(term_id)["category"])
+    store.review("u/1", 4, QUALITY_HARD, TODAY, now=NOW, category=catalog.get(4)["category"])
+    store.review("u/1", 5, QUALITY_GOOD, TODAY, now=NOW, category=catalog.get(5)["category"])
+    store.daily_terms("u/1", TODAY, catalog)
+    store.complete("bob", 7, now=NOW)
+    expected = snapshot(store.get("u/1"))
+    store.flush()
+
+    reopened = open_store()
+    assert snapshot(reopened.get("u/1")) == expected
+    assert expected["monthly"] == {MONTH: 4}
+    assert list(expected["awards"][MONTH]) == [2]
+    assert sorted(expected["cards"]) == [4, 5]
+
+
+def test_reset_round_trip_keeps_ledger(open_store):
+    store = open_store()
+    for term_id in range(5):
+        store.complete("a", term_id, now=NOW)
+    store.flush()
+    store.reset("a")
+    store.complete("a", 9, now=NOW)
+    store.flush()
+    progress = open_store().get("a")
+    assert list(progress.all_time_completed) == [9]
+    assert progress.ledger.count(MONTH) == 6
+
+
+def test_unflushed_ops_survive_eviction_and_reload(open_store):
+    store = open_store(max_cached_users=1)
+    store.complete("a", 1, now=NOW)
+    store.complete("b", 2, now=NOW)
+    store.flush()
+    assert store.cached_users() == 1
+    assert 1 in store.get("a").all_time_completed
+
+
+def test_review_once_per_day_and_no_future_dates(open_store):
+    store = open_store()
+    assert store.review("a", 1, QUALITY_GOOD, TODAY) is not None
+    assert store.review("a", 1, QUALITY_HARD, TODAY) is None
+    assert store.review("a", 1, QUALITY_HARD, TODAY - timedelta(days=3)) is None
+    with pytest.raises(ValueError):
+        store.review("a", 2, QUALITY_GOOD, TODAY + timedelta(days=1))
+    assert 2 not in store.get("a").cards
+
+
+def test_daily_terms_pinned_and_kept_when_scope_narrows(open_store, catalog):
+    from conftest import make_catalog
+    from catalog import TermCatalog
+
+    store = open_store()
+    pinned = store.daily_terms("a", TODAY, catalog)
+    assert store.daily_terms("a", TODAY, catalog) == pinned
+    scoped = TermCatalog((term for term in catalog.terms if term["category"].startswith("분야0")), scoped=True)
+    assert store.daily_terms("a", TODAY, scoped, catalog) == pinned
+    # 카탈로그에서 사라진 용어가 있으면 새로 고른다
+    smaller = make_catalog(3)
+    assert set(store.daily_terms("a", TODAY, smaller)) <= set(smaller.ids)
+
+
+def test_other_process_writes_are_reloaded(open_store):
+    first = open_store()
+    second = open_store()
+    first.complete("a", 1, now=NOW)
+    second.get("a")
+    first.flush()
+    second.flush()
+    assert 1 in second.get("a").all_time_completed
+    # 자기 기록으로는 다시 읽지 않는다
+    cached = second.get("a")
+    second.complete("a", 2, now=NOW)
+    second.flush()
+    assert second.get("a") is cached
+    first.flush()
+    time.sleep(0.01)
+    first.flush()
+    assert 2 in first.get("a").all_time_completed
+
+
+def test_user_totals_include_reset_users(open_store):
+    store = open_store()
+    for term_id in range(3):
+        store.complete("a", term_id, now=NOW)
+    store.reset("a")
+    store.review("b", 1, QUALITY_HARD, TODAY)
+    store.flush()
+    totals = sorted(store.backend.iter_user_totals(MONTH))
+    assert totals == [("a", 0, 3, 0), ("b", 0, 0, 1)]
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import make_catalog
+from progress_store import UserProgress
+from scheduler import DAILY_COUNT, DailyScheduler, pick_daily_terms
+from srs import Card
+
+DAY = date(2026, 3, 2)
+
+
+@pytest.mark.parametrize("n_terms", [1, 2, 5, 6, 7, 64, 100, 1000])
+def test_permutation_covers_every_term_once(n_terms):
+    catalog = make_catalog(n_terms)
+    scheduler = DailyScheduler(catalog, "alice")
+    # 연속한 n개 위치는 카탈로그 용어를 한 번씩 모두 지난다 (어디서 시작하든)
+    for start in (0, 12345):
+        picked = [scheduler._term_at(start + i) for i in range(n_terms)]
+        assert sorted(picked) == sorted(catalog.ids)
+
+
+def test_consecutive_days_do_not_overlap():
+    catalog = make_catalog(600)
+    scheduler = DailyScheduler(catalog, "alice")
+    days = [scheduler.terms_for(DAY + timedelta(days=offset)) for offset in range(100)]
+    flat = [term_id for terms in days for term_id in terms]
+    assert all(len(terms) == DAILY_COUNT for terms in days)
+    assert len(set(flat)) == len(flat)
+
+
+def test_schedule_is_deterministic_per_user():
+    catalog = make_catalog(500)
+    first = DailyScheduler(catalog, "alice").schedule(DAY, 7)
+    assert DailyScheduler(catalog, "alice").schedule(DAY, 7) == first
+    assert DailyScheduler(catalog, "bob").schedule(DAY, 7) != first
+
+
+def test_small_catalog_serves_at_most_its_size():
+    catalog = make_catalog(3)
+    assert sorted(DailyScheduler(catalog, "alice").terms_for(DAY)) == catalog.ids
+
+
+def test_new_terms_for_skips_excluded_and_stops_after_probes():
+    catalog = make_catalog(5000)
+    scheduler = DailyScheduler(catalog, "alice")
+    known = set(scheduler.terms_for(DAY))
+    picked = scheduler.new_terms_for(DAY, DAILY_COUNT, known.__contains__)
+    assert len(picked) == DAILY_COUNT and not known & set(picked)
+    # 모두 제외하면 probes개 위치만 보고 끝난다
+    assert scheduler.new_terms_for(DAY, DAILY_COUNT, lambda term_id: True, probes=10) == []
+
+
+def test_pick_daily_terms_puts_due_cards_first_and_skips_known():
+    catalog = make_catalog(200)
+    progress = UserProgress()
+    progress.due_index.push(Card(7, due=DAY.toordinal() - 1))
+    progress.due_index.push(Card(9, due=DAY.toordinal() + 3))
+    for term_id in range(100):
+        if term_id not in (7, 9):
+            progress.all_time_completed.add(term_id)
+    picked = pick_daily_terms(catalog, progress, "alice", DAY)
+    assert picked[0] == 7
+    assert len(picked) == DAILY_COUNT == len(set(picked))
+    assert all(term_id >= 100 for term_id in picked[1:])
+
+
+def test_pick_daily_terms_fills_when_everything_is_known():
+    catalog = make_catalog(50)
+    progress = UserProgress()
+    for term_id in catalog.ids:
+        progress.all_time_completed.add(term_id)
+    picked = pick_daily_terms(catalog, progress, "alice", DAY)
+    assert len(picked) == DAILY_COUNT == len(set(picked))
@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import srs
+from srs import Card, DueIndex, MIN_EASE, QUALITY_GOOD, QUALITY_HARD
+
+TODAY = date(2026, 3, 2)
+
+
+def test_review_intervals_follow_sm2():
+    card = Card(1)
+    card = srs.review(card, QUALITY_GOOD, TODAY)
+    assert (card.interval, card.reps, card.due) == (1, 1, TODAY.toordinal() + 1)
+    card = srs.review(card, QUALITY_GOOD, TODAY + timedelta(days=1))
+    assert (card.interval, card.reps) == (6, 2)
+    previous = card
+    card = srs.review(card, QUALITY_GOOD, TODAY + timedelta(days=7))
+    assert card.interval == round(previous.interval * previous.ease)
+    assert card.last_review == (TODAY + timedelta(days=7)).toordinal()
+
+
+def test_hard_review_restarts_and_lowers_ease():
+    card = srs.review(srs.review(Card(1), QUALITY_GOOD, TODAY), QUALITY_GOOD, TODAY + timedelta(days=1))
+    hard = srs.review(card, QUALITY_HARD, TODAY + timedelta(days=7))
+    assert (hard.interval, hard.reps) == (1, 0)
+    assert hard.ease < card.ease
+
+
+def test_ease_never_drops_below_minimum():
+    card = Card(1)
+    for offset in range(20):
+        card = srs.review(card, 0, TODAY + timedelta(days=offset))
+    assert card.ease == MIN_EASE
+
+
+def test_due_terms_returns_most_urgent_first():
+    index = DueIndex()
+    for term_id, due_offset in [(1, 3), (2, -2), (3, 0), (4, -5), (5, 10)]:
+        index.push(Card(term_id, due=TODAY.toordinal() + due_offset))
+    assert index.due_terms(TODAY, 10) == [4, 2, 3]
+    assert index.due_terms(TODAY, 2) == [4, 2]
+    # 꺼냈던 항목은 다시 힙에 들어가 다음 조회에도 나온다
+    assert index.due_terms(TODAY, 10) == [4, 2, 3]
+
+
+def test_due_terms_skips_stale_and_duplicate_entries():
+    index = DueIndex()
+    index.push(Card(1, due=TODAY.toordinal() - 1))
+    # 복습으로 다음 복습일이 미뤄지면 예전 항목은 버려진다
+    index.push(Card(1, due=TODAY.toordinal() + 5))
+    # 같은 복습일로 두 번 들어간 항목은 한 번만
+    index.push(Card(2, due=TODAY.toordinal()))
+    index.push(Card(2, due=TODAY.toordinal()))
+    assert index.due_terms(TODAY, 10) == [2]
+    assert len(index) == 2
+
+
+def test_due_terms_include_filter_and_clear():
+    index = DueIndex()
+    for term_id in range(6):
+        index.push(Card(term_id, due=TODAY.toordinal() - term_id))
+    assert index.due_terms(TODAY, 2, include=lambda term_id: term_id % 2 == 0) == [4, 2]
+    index.clear()
+    assert index.due_terms(TODAY, 10) == []
+    assert len(index) == 0
+
+
+def test_due_index_built_from_existing_cards():
+    cards = {term_id: Card(term_id, due=TODAY.toordinal() - term_id) for term_id in range(3)}
+    assert DueIndex(cards).due_terms(TODAY, 10) == [2, 1, 0]
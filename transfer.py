@@ -0,0 +1,231 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import sys
+import threading
+from datetime import date
+
+import term_store
+from catalog import CATEGORY_SEP
+
+# 대량 가져오기 / 내보내기
+# 용어 파일은 한 줄씩 읽어 검증·중복 제거한 뒤 chunk_size 행 단위로 용어 저장소에 덧붙이고,
+# 학습 기록은 저장소에서 한 행씩 읽어 CSV 또는 JSON Lines로 흘려 보낸다.
+# 어느 쪽도 파일 전체를 메모리에 올리지 않는다.
+IMPORT_FORMATS = ("csv", "jsonl")
+MAX_FIELD_LENGTH = 300
+MAX_REPORTED_ERRORS = 20
+PROGRESS_FIELDS = ("term_id", "category", "term", "definition", "completed_at", "interval", "ease", "due", "reps")
+DAILY_FIELDS = ("date", "position", "term_id", "term", "definition")
+
+_import_lock = threading.Lock()
+
+
+class ImportReport:
+    def __init__(self):
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def reject(self, line_no, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{line_no}행: {message}")
+
+
+# 중복 판정 키: (카테고리 경로, 대소문자 무시한 용어)의 8바이트 해시
+def term_key(category, term):
+    digest = hashlib.blake2b(f"{category}\0{term.casefold()}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def iter_records(stream, fmt="csv"):
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+# 검증을 통과하면 (category, term, definition), 아니면 오류 메시지
+def validate_record(record):
+    if not isinstance(record, dict):
+        return None, "행을 읽을 수 없습니다"
+    values = {}
+    for field in ("category", "term", "definition"):
+        value = record.get(field)
+        value = value.strip() if isinstance(value, str) else ""
+        if not value:
+            return None, f"{field} 값이 비어 있습니다"
+        if len(value) > MAX_FIELD_LENGTH:
+            return None, f"{field} 값이 너무 깁니다"
+        values[field] = value
+    parts = [part.strip() for part in values["category"].split(CATEGORY_SEP)]
+    if not all(parts):
+        return None, "카테고리 경로에 빈 단계가 있습니다"
+    return (CATEGORY_SEP.join(parts), values["term"], values["definition"]), None
+
+
+# stream: 텍스트 스트림 (CSV는 category, term, definition 열 / JSON Lines는 같은 키)
+# terms_path를 주지 않으면 작업용 덱에 덧붙인다 (term_store.writable_terms_path)
+def import_terms(stream, terms_path=None, fmt="csv", chunk_size=1000):
+    report = ImportReport()
+    terms_path = terms_path or term_store.writable_terms_path()
+    with _import_lock:
+        keys = set()
+        next_id = 0
+        for row in term_store.iter_rows(terms_path):
+            keys.add(term_key(row["category"], row["term"]))
+            next_id = max(next_id, row["id"] + 1)
+
+        chunk = []
+        for line_no, record in enumerate(iter_records(stream, fmt), start=2 if fmt == "csv" else 1):
+            values, error = validate_record(record)
+            if error:
+                report.reject(line_no, error)
+                continue
+            category, term, definition = values
+            key = term_key(category, term)
+            if key in keys:
+                report.duplicates += 1
+                continue
+            keys.add(key)
+            chunk.append({"id": next_id, "category": category, "term": term, "definition": definition})
+            next_id += 1
+            if len(chunk) >= chunk_size:
+                term_store.append_rows(terms_path, chunk)
+                report.added += len(chunk)
+                chunk = []
+        if chunk:
+            term_store.append_rows(terms_path, chunk)
+            report.added += len(chunk)
+    return report
+
+
+def _term_fields(catalog, term_id):
+    if term_id not in catalog:
+        return {"category": "", "term": "", "definition": ""}
+    term = catalog.get(term_id)
+    return {"category": term["category"], "term": term["term"], "definition": term["definition"]}
+
+
+# 완료했거나 복습 카드가 있는 용어별 학습 기록
+def iter_progress_records(store, catalog, user_id):
+    store.flush()
+    progress = store.get(user_id)
+    for term_id, completed_at in store.backend.iter_completions(user_id):
+        card = progress.cards.get(term_id)
+        yield {
+            "term_id": term_id,
+            **_term_fields(catalog, term_id),
+            "completed_at": completed_at,
+            "interval": card.interval if card else "",
+            "ease": card.ease if card else "",
+            "due": date.fromordinal(card.due).isoformat() if card else "",
+            "reps": card.reps if card else "",
+        }
+    for term_id, card in list(progress.cards.items()):
+        if term_id not in progress.all_time_completed:
+            yield {
+                "term_id": term_id,
+                **_term_fields(catalog, term_id),
+                "completed_at": "",
+                "interval": card.interval,
+                "ease": card.ease,
+                "due": date.fromordinal(card.due).isoformat(),
+                "reps": card.reps,
+            }
+
+
+# 날짜별 오늘의 학습 기록
+def iter_daily_records(store, catalog, user_id):
+    store.flush()
+    for date_key, term_ids in store.backend.iter_daily(user_id):
+        for position, term_id in enumerate(term_ids, start=1):
+            fields = _term_fields(catalog, term_id)
+            yield {
+                "date": date_key,
+                "position": position,
+                "term_id": term_id,
+                "term": fields["term"],
+                "definition": fields["definition"],
+            }
+
+
+# 레코드를 한 줄씩 텍스트로 변환
+def iter_lines(records, fields, fmt="csv"):
+    if fmt == "jsonl":
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    yield buffer.getvalue()
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record)
+        yield buffer.getvalue()
+
+
+def write_lines(lines, f):
+    for line in lines:
+        f.write(line)
+
+
+# python transfer.py import glossary.csv
+# python transfer.py export --user alice --kind progress --out alice.csv
+def main(argv=None):
+    from progress_store import DEFAULT_PROGRESS_PATH, ProgressStore, open_backend
+
+    parser = argparse.ArgumentParser(description="용어 가져오기 / 학습 기록 내보내기")
+    parser.add_argument("--terms", default=None, help="기본값: 가져오기는 작업용 덱, 내보내기는 읽는 용어 파일")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import")
+    import_parser.add_argument("source")
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, default="csv")
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("--user", required=True)
+    export_parser.add_argument("--kind", choices=("progress", "daily"), default="progress")
+    export_parser.add_argument("--format", choices=IMPORT_FORMATS, default="csv")
+    export_parser.add_argument("--progress", default=DEFAULT_PROGRESS_PATH)
+    export_parser.add_argument("--out", default="-")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        with open(args.source, newline="", encoding="utf-8-sig") as f:
+            report = import_terms(f, args.terms, args.format)
+        print(f"추가 {report.added}개, 중복 {report.duplicates}개, 오류 {report.invalid}개")
+        for error in report.errors:
+            print(error)
+        return
+
+    catalog = term_store.load_catalog(args.terms or term_store.default_terms_path())
+    store = ProgressStore(open_backend(args.progress))
+    try:
+        if args.kind == "progress":
+            lines = iter_lines(iter_progress_records(store, catalog, args.user), PROGRESS_FIELDS, args.format)
+        else:
+            lines = iter_lines(iter_daily_records(store, catalog, args.user), DAILY_FIELDS, args.format)
+        if args.out == "-":
+            write_lines(lines, sys.stdout)
+        else:
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                write_lines(lines, f)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()